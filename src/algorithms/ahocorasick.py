@@ -1,4 +1,8 @@
-from collections import deque
+import os
+import struct
+import sys
+from array import array
+from collections import Counter, deque
 
 class AhoCorasick:
     def __init__(self):
@@ -94,9 +98,224 @@ class AhoCorasick:
         
         return results
 
+    def count_matches(self, text):
+        counts = {pattern: 0 for pattern in self.patterns}
+        if not self.patterns or not text:
+            return counts
+        
+        self._build_failure_and_output()
+        
+        state = 0
+        
+        for char in text:
+            while state != 0 and char not in self.goto_table[state]:
+                state = self.failure_table[state]
+            
+            if char in self.goto_table[state]:
+                state = self.goto_table[state][char]
+            
+            if state in self.output_table:
+                for pattern in self.output_table[state]:
+                    counts[pattern] += 1
+        
+        return counts
+
 
 def aho_corasick_search(text, patterns):
     ac = AhoCorasick()
     ac.add_patterns(patterns)
     
-    return ac.search(text)
\ No newline at end of file
+    return ac.search(text)
+
+class _ColumnTable(dict):
+    def __missing__(self, key):
+        return "\x00"
+
+
+class CompiledAhoCorasick:
+    """
+    Varian Aho-Corasick yang dikompilasi menjadi DFA penuh di atas array integer.
+    Alfabet diremap ke kolom padat (kolom 0 untuk karakter di luar alfabet pattern),
+    transitions[row + col] langsung berisi offset baris state berikutnya
+    (state * width), sehingga loop pencarian tidak perlu mengejar failure link.
+    """
+    MAGIC = b"SCAC"
+    VERSION = 1
+    _HEADER = struct.Struct("<4sHHIIIII")
+
+    def __init__(self, patterns=None):
+        self.patterns = []
+        self.alphabet = ""
+        self.width = 1
+        self.state_count = 1
+        self.transitions = array("i", [0])
+        self.output_offsets = array("i", [0, 0])
+        self.output_ids = array("i")
+        self._init_lookup()
+        
+        if patterns:
+            self.compile(patterns)
+    
+    def _init_lookup(self):
+        self._column_table = _ColumnTable({ord(char): chr(col + 1) for col, char in enumerate(self.alphabet)})
+        self._row_outputs = {}
+        for state in range(self.state_count):
+            start, end = self.output_offsets[state], self.output_offsets[state + 1]
+            if start != end:
+                self._row_outputs[state * self.width] = list(self.output_ids[start:end])
+    
+    def _columns(self, text):
+        columns = text.translate(self._column_table)
+        if self.width <= 256:
+            return columns.encode("latin-1")
+        return map(ord, columns)
+    
+    def compile(self, patterns):
+        unique_patterns = list(dict.fromkeys(p for p in patterns if p))
+        trie = AhoCorasick()
+        trie.add_patterns(unique_patterns)
+        trie._build_failure_and_output()
+        
+        self.patterns = unique_patterns
+        self.alphabet = "".join(sorted({char for pattern in unique_patterns for char in pattern}))
+        char_map = {char: col + 1 for col, char in enumerate(self.alphabet)}
+        self.width = width = len(self.alphabet) + 1
+        self.state_count = trie.state_count
+        
+        transitions = array("i", [0]) * (self.state_count * width)
+        
+        queue = deque()
+        for char, state in trie.goto_table[0].items():
+            transitions[char_map[char]] = state * width
+            queue.append(state)
+        
+        # urutan BFS menjamin baris state failure sudah lengkap sebelum disalin
+        while queue:
+            r = queue.popleft()
+            base = r * width
+            fail_base = trie.failure_table[r] * width
+            transitions[base:base + width] = transitions[fail_base:fail_base + width]
+            for char, u in trie.goto_table[r].items():
+                transitions[base + char_map[char]] = u * width
+                queue.append(u)
+        
+        pattern_ids = {pattern: i for i, pattern in enumerate(unique_patterns)}
+        output_offsets = array("i", [0])
+        output_ids = array("i")
+        for state in range(self.state_count):
+            for pattern in trie.output_table.get(state, []):
+                output_ids.append(pattern_ids[pattern])
+            output_offsets.append(len(output_ids))
+        
+        self.transitions = transitions
+        self.output_offsets = output_offsets
+        self.output_ids = output_ids
+        self._init_lookup()
+        return self
+    
+    def search(self, text):
+        if not self.patterns or not text:
+            return []
+        
+        transitions, row_outputs, patterns = self.transitions, self._row_outputs, self.patterns
+        
+        results = []
+        row = 0
+        
+        for i, col in enumerate(self._columns(text)):
+            row = transitions[row + col]
+            if row in row_outputs:
+                for pattern_id in row_outputs[row]:
+                    pattern = patterns[pattern_id]
+                    results.append((pattern, i - len(pattern) + 1, i))
+        
+        return results
+    
+    def count_matches(self, text):
+        counts = [0] * len(self.patterns)
+        if self.patterns and text:
+            transitions = self.transitions
+            visited = []
+            visit = visited.append
+            row = 0
+            for col in self._columns(text):
+                row = transitions[row + col]
+                visit(row)
+            
+            row_outputs = self._row_outputs
+            for row, hits in Counter(visited).items():
+                if row in row_outputs:
+                    for pattern_id in row_outputs[row]:
+                        counts[pattern_id] += hits
+        
+        return dict(zip(self.patterns, counts))
+    
+    def save(self, path):
+        alphabet_bytes = self.alphabet.encode("utf-8")
+        encoded_patterns = [pattern.encode("utf-8") for pattern in self.patterns]
+        arrays = [self.transitions, self.output_offsets, self.output_ids]
+        if sys.byteorder != "little":
+            arrays = [array("i", a) for a in arrays]
+            for a in arrays:
+                a.byteswap()
+        
+        with open(path, "wb") as f:
+            f.write(self._HEADER.pack(
+                self.MAGIC, self.VERSION, 0,
+                self.state_count, self.width, len(self.output_ids),
+                len(alphabet_bytes), len(encoded_patterns)
+            ))
+            f.write(alphabet_bytes)
+            for pattern in encoded_patterns:
+                f.write(struct.pack("<I", len(pattern)))
+                f.write(pattern)
+            for a in arrays:
+                f.write(a.tobytes())
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        
+        header = cls._HEADER.unpack_from(data, 0)
+        magic, version, _, state_count, width, output_count, alphabet_len, pattern_count = header
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"Not a compiled Aho-Corasick file: {path}")
+        pos = cls._HEADER.size
+        
+        automaton = cls()
+        automaton.alphabet = data[pos:pos + alphabet_len].decode("utf-8")
+        pos += alphabet_len
+        for _ in range(pattern_count):
+            (length,) = struct.unpack_from("<I", data, pos)
+            pos += 4
+            automaton.patterns.append(data[pos:pos + length].decode("utf-8"))
+            pos += length
+        automaton.width = width
+        automaton.state_count = state_count
+        
+        for name, length in (("transitions", state_count * width),
+                             ("output_offsets", state_count + 1),
+                             ("output_ids", output_count)):
+            a = array("i")
+            a.frombytes(data[pos:pos + length * a.itemsize])
+            if sys.byteorder != "little":
+                a.byteswap()
+            setattr(automaton, name, a)
+            pos += length * a.itemsize
+        
+        automaton._init_lookup()
+        return automaton
+
+
+def load_compiled_automaton(path, patterns=None):
+    """
+    Memuat automaton terkompilasi dari file biner. Jika file belum ada dan
+    patterns diberikan, automaton dikompilasi lalu disimpan ke path tersebut.
+    """
+    if os.path.exists(path):
+        return CompiledAhoCorasick.load(path)
+    automaton = CompiledAhoCorasick(patterns or [])
+    if patterns:
+        automaton.save(path)
+    return automaton
@@ -12,9 +12,42 @@ def bad_char_heuristic(pattern):
     
     return bad_char
 
+def good_suffix_table(pattern):
+    """
+    Menghitung tabel good suffix (strong good suffix rule).
+    shift[j + 1] adalah pergeseran aman jika terjadi mismatch pada posisi j,
+    sedangkan shift[0] adalah periode pola yang dipakai setelah full match.
+    """
+    m = len(pattern)
+    shift = [0] * (m + 1)
+    border = [0] * (m + 1)
+
+    # Kasus 1: suffix yang cocok muncul lagi di dalam pola
+    i, j = m, m + 1
+    border[i] = j
+    while i > 0:
+        while j <= m and pattern[i - 1] != pattern[j - 1]:
+            if shift[j] == 0:
+                shift[j] = j - i
+            j = border[j]
+        i -= 1
+        j -= 1
+        border[i] = j
+
+    # Kasus 2: hanya sebagian suffix yang cocok dengan prefix pola
+    j = border[0]
+    for i in range(m + 1):
+        if shift[i] == 0:
+            shift[i] = j
+        if i == j:
+            j = border[j]
+
+    return shift
+
 def boyer_moore_search(text, pattern):
     """
-    Implementasi algoritma Boyer-Moore dengan bad character heuristic.
+    Implementasi algoritma Boyer-Moore lengkap: bad character heuristic,
+    good suffix rule, dan Galil rule sehingga worst case tetap linear.
     Mengembalikan daftar indeks di mana pola ditemukan dalam teks.
     """
     n = len(text)
@@ -27,35 +60,91 @@ def boyer_moore_search(text, pattern):
         return []
 
     bad_char = bad_char_heuristic(pattern)
-    
+    good_suffix = good_suffix_table(pattern)
+    period = good_suffix[0]
+
     s = 0  # shift dari pola terhadap teks
+    bound = 0  # Galil rule: prefix pola sebelum indeks ini sudah pasti cocok
     matches = []
 
     while s <= (n - m):
         j = m - 1
 
         # Cocokkan karakter dari kanan ke kiri
-        while j >= 0 and pattern[j] == text[s + j]:
+        while j >= bound and pattern[j] == text[s + j]:
             j -= 1
 
-        # Jika pola ditemukan (j menjadi -1)
-        if j < 0:
+        # Jika pola ditemukan
+        if j < bound:
             matches.append(s)
-            # Geser berdasarkan karakter setelah match (jika ada)
-            if s + m < n:
-                next_char = text[s + m]
-                s += m - bad_char.get(next_char, -1)
-            else:
-                s += 1  # Jika sudah di akhir teks
+            # Geser sejauh periode pola, m - period karakter awal sudah pasti cocok
+            s += period
+            bound = m - period
         else:
-            # Karakter tidak cocok pada posisi j
-            mismatched_char = text[s + j]
-            
-            # Hitung shift berdasarkan bad character rule
-            # j adalah posisi dalam pola, bad_char.get() memberikan posisi terakhir karakter
-            shift = j - bad_char.get(mismatched_char, -1)
-            
-            # Pastikan shift minimal 1 untuk menghindari loop tak hingga
-            s += max(1, shift)
-            
-    return matches
\ No newline at end of file
+            # Ambil pergeseran terbesar dari bad character dan good suffix rule
+            shift = j - bad_char.get(text[s + j], -1)
+            s += max(good_suffix[j + 1], shift)
+            bound = 0
+
+    return matches
+
+def horspool_search(text, pattern):
+    """
+    Varian Boyer-Moore-Horspool: pergeseran hanya ditentukan oleh karakter teks
+    yang sejajar dengan karakter terakhir pola.
+    """
+    n = len(text)
+    m = len(pattern)
+
+    if m == 0 or n < m:
+        return []
+
+    # Jarak dari kemunculan terakhir setiap karakter (kecuali karakter terakhir) ke ujung pola
+    shift_table = {}
+    for i in range(m - 1):
+        shift_table[pattern[i]] = m - 1 - i
+
+    last_char = pattern[m - 1]
+    s = 0
+    matches = []
+
+    while s <= n - m:
+        end_char = text[s + m - 1]
+        if end_char == last_char and text[s:s + m - 1] == pattern[:m - 1]:
+            matches.append(s)
+        s += shift_table.get(end_char, m)
+
+    return matches
+
+def sunday_search(text, pattern):
+    """
+    Varian Sunday (quick search): pergeseran ditentukan oleh karakter teks
+    tepat setelah window pola, sehingga bisa melompat hingga m + 1 karakter.
+    """
+    n = len(text)
+    m = len(pattern)
+
+    if m == 0 or n < m:
+        return []
+
+    shift_table = {}
+    for i in range(m):
+        shift_table[pattern[i]] = m - i
+
+    s = 0
+    matches = []
+
+    while s <= n - m:
+        if text[s:s + m] == pattern:
+            matches.append(s)
+        if s + m >= n:
+            break
+        s += shift_table.get(text[s + m], m + 1)
+
+    return matches
+
+BOYER_MOORE_VARIANTS = {
+    "full": boyer_moore_search,
+    "horspool": horspool_search,
+    "sunday": sunday_search,
+}
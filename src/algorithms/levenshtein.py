@@ -0,0 +1,125 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Di bawah jumlah kata ini overhead NumPy lebih mahal daripada loop biasa
+BATCH_MIN_WORDS = 64
+
+
+def levenshtein_distance(s1, s2, max_distance=None):
+    """
+    Jarak Levenshtein antara s1 dan s2. Jika max_distance diberikan, hasil yang
+    lebih besar dari max_distance dikembalikan sebagai max_distance + 1.
+    """
+    if max_distance is not None:
+        return bounded_levenshtein(s1, s2, max_distance)
+    if len(s1) < len(s2):
+        return levenshtein_distance(s2, s1)
+    if len(s2) == 0:
+        return len(s1)
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def bounded_levenshtein(s1, s2, max_distance):
+    """
+    Levenshtein dengan batas: prefilter selisih panjang, DP berpita (Ukkonen)
+    selebar 2 * max_distance + 1 di sekitar diagonal, dan berhenti lebih awal
+    begitu seluruh baris melebihi max_distance. Mengembalikan jarak sebenarnya
+    jika <= max_distance, selain itu max_distance + 1.
+    """
+    limit = max_distance + 1
+    n, m = len(s1), len(s2)
+    if abs(n - m) > max_distance:
+        return limit
+    if s1 == s2:
+        return 0
+    if m == 0 or n == 0:
+        return max(n, m)
+
+    # Sel di luar pita pasti berjarak > max_distance, cukup diisi limit
+    previous_row = [j if j <= max_distance else limit for j in range(m + 1)]
+    for i in range(1, n + 1):
+        c1 = s1[i - 1]
+        lo = max(1, i - max_distance)
+        hi = min(m, i + max_distance)
+        current_row = [limit] * (m + 1)
+        if i <= max_distance:
+            current_row[0] = i
+        row_min = current_row[0]
+        for j in range(lo, hi + 1):
+            value = previous_row[j - 1] + (c1 != s2[j - 1])
+            if previous_row[j] + 1 < value:
+                value = previous_row[j] + 1
+            if current_row[j - 1] + 1 < value:
+                value = current_row[j - 1] + 1
+            if value > limit:
+                value = limit
+            current_row[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return limit
+        previous_row = current_row
+    return min(previous_row[m], limit)
+
+
+def levenshtein_within(s1, s2, max_distance):
+    return bounded_levenshtein(s1, s2, max_distance) <= max_distance
+
+
+def _numpy_batch(keyword, words, max_distance):
+    """
+    Skor satu keyword terhadap sekelompok kata dengan panjang sama sekaligus.
+    Baris DP diproses untuk semua kata bersamaan; ketergantungan insertion di
+    sepanjang baris diselesaikan dengan minimum kumulatif.
+    """
+    m = len(keyword)
+    length = len(words[0])
+    codes = np.array([[ord(c) for c in word] for word in words], dtype=np.int32).reshape(len(words), length)
+    key = np.array([ord(c) for c in keyword], dtype=np.int32)
+    offsets = np.arange(m + 1, dtype=np.int32)
+
+    previous_row = np.broadcast_to(offsets, (len(words), m + 1)).copy()
+    for i in range(1, length + 1):
+        cost = (codes[:, i - 1:i] != key).astype(np.int32)
+        current_row = np.empty_like(previous_row)
+        current_row[:, 0] = i
+        current_row[:, 1:] = np.minimum(previous_row[:, :-1] + cost, previous_row[:, 1:] + 1)
+        current_row = np.minimum.accumulate(current_row - offsets, axis=1) + offsets
+        previous_row = current_row
+    return np.minimum(previous_row[:, m], max_distance + 1).tolist()
+
+
+def levenshtein_batch(keyword, words, max_distance):
+    """
+    Jarak Levenshtein (dibatasi max_distance + 1) antara keyword dan setiap kata.
+    Kata yang selisih panjangnya terlalu jauh langsung dilewati; sisanya
+    dikelompokkan per panjang dan dihitung dengan NumPy jika tersedia.
+    """
+    limit = max_distance + 1
+    distances = [limit] * len(words)
+    by_length = {}
+    for position, word in enumerate(words):
+        if abs(len(word) - len(keyword)) <= max_distance:
+            by_length.setdefault(len(word), []).append(position)
+
+    use_numpy = np is not None and len(words) >= BATCH_MIN_WORDS and len(keyword) > 0
+    for length, positions in by_length.items():
+        group = [words[p] for p in positions]
+        if use_numpy and length > 0:
+            scores = _numpy_batch(keyword, group, max_distance)
+        else:
+            scores = [bounded_levenshtein(word, keyword, max_distance) for word in group]
+        for position, score in zip(positions, scores):
+            distances[position] = score
+    return distances
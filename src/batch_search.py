@@ -0,0 +1,151 @@
+import os
+import sys
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from services.file_service import CORPUS_CACHE_BYTES
+from services import search_worker
+from services.search_worker import init_worker, load_worker_state, run_query
+
+ALGORITHMS = ["kmp", "bm", "ac"]
+
+
+def log(message):
+    # Semua output selain hasil JSONL ditulis ke stderr
+    print(message, file=sys.stderr)
+
+
+def parse_queries(lines, args):
+    """
+    Satu query per baris: daftar keyword dipisah koma, atau objek JSON dengan
+    "keywords" dan opsional "id", "algorithm", "max_results", "max_distance".
+    Baris kosong dan baris yang diawali # dilewati; id default = nomor baris.
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        query = {"id": line_number, "keywords": line, "algorithm": args.algorithm,
+                 "max_results": args.max_results, "max_distance": args.max_distance}
+        if line.startswith("{"):
+            try:
+                fields = json.loads(line)
+            except json.JSONDecodeError as e:
+                log(f"Skipping line {line_number}: invalid JSON ({e})")
+                continue
+            if not isinstance(fields, dict) or not isinstance(fields.get("keywords"), str):
+                log(f"Skipping line {line_number}: missing \"keywords\" string")
+                continue
+            query.update({key: fields[key] for key in query if key in fields})
+            try:
+                query["algorithm"] = str(query["algorithm"]).lower()
+                query["max_results"] = int(query["max_results"])
+                query["max_distance"] = int(query["max_distance"])
+            except (TypeError, ValueError):
+                log(f"Skipping line {line_number}: \"max_results\" and \"max_distance\" must be integers")
+                continue
+        if query["algorithm"] not in ALGORITHMS:
+            log(f"Skipping line {line_number}: unknown algorithm {query['algorithm']!r}")
+            continue
+        yield query
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round((len(sorted_values) - 1) * q / 100)))]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run keyword queries against the CV corpus without the GUI and stream JSONL results")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="File with one query per line (comma separated keywords or a JSON object); '-' reads stdin (default)")
+    parser.add_argument("--output", help="Write JSONL results to this file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes running queries in parallel (default: CPU count; 1 runs inline)")
+    parser.add_argument("--algorithm", default="kmp", choices=ALGORITHMS, help="Default algorithm (default: kmp)")
+    parser.add_argument("--max-results", type=int, default=10, help="Default results per query, 0 for all (default: 10)")
+    parser.add_argument("--max-distance", type=int, default=1, help="Default Levenshtein distance for fuzzy matches (default: 1)")
+    parser.add_argument("--skip-names", action="store_true", help="Do not look up applicant names in the database")
+    parser.add_argument("--no-index", action="store_true", help="Always scan the corpus instead of using the inverted index")
+    parser.add_argument("--trace", action="store_true", help="Include the per-phase trace in every record")
+    parser.add_argument("--cache-mb", type=int, default=CORPUS_CACHE_BYTES // (1024 * 1024),
+                        help="Corpus text cache per process in MB")
+    args = parser.parse_args(argv)
+
+    stdout = sys.stdout
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    out = open(args.output, "w", encoding="utf-8") if args.output else stdout
+    # print dari service dialihkan ke stderr selama batch berjalan supaya stdout hanya berisi JSONL
+    sys.stdout = sys.stderr
+    try:
+        return run_batch(args, source, out)
+    finally:
+        sys.stdout = stdout
+        if source is not sys.stdin:
+            source.close()
+        if args.output:
+            out.close()
+
+
+def run_batch(args, source, out):
+    load_start = time.perf_counter()
+    memory_budget = args.cache_mb * 1024 * 1024
+    load_worker_state(memory_budget, not args.no_index)
+    info = search_worker.worker_info()
+    log(f"Loaded {info['cv_count']} CVs ({'index' if info['index'] else 'full scan'}) "
+        f"in {time.perf_counter() - load_start:.2f}s")
+
+    workers = max(1, args.workers)
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                       initargs=(memory_budget, not args.no_index))
+    # Query dibaca bertahap dan dibatasi jumlahnya yang sedang berjalan, hasil ditulis sesuai urutan input
+    max_pending = workers * 4
+    pending = deque()
+    elapsed, errors = [], 0
+    run_start = time.perf_counter()
+
+    def write(record):
+        nonlocal errors
+        if "error" in record:
+            errors += 1
+        elapsed.append(record["elapsed_ms"])
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+
+    try:
+        for query in parse_queries(source, args):
+            if executor is None:
+                write(run_query(query, not args.skip_names, args.trace))
+                continue
+            pending.append(executor.submit(run_query, query, not args.skip_names, args.trace))
+            while pending and (pending[0].done() or len(pending) >= max_pending):
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+    except KeyboardInterrupt:
+        log("Interrupted, remaining queries cancelled")
+        for future in pending:
+            future.cancel()
+        return 130
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    total_s = time.perf_counter() - run_start
+    values = sorted(elapsed)
+    log(f"{len(values)} queries ({errors} failed) in {total_s:.2f}s "
+        f"= {len(values) / total_s if total_s else 0:.1f} queries/s, "
+        f"p50 {_percentile(values, 50):.1f}ms, p90 {_percentile(values, 90):.1f}ms, p99 {_percentile(values, 99):.1f}ms")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
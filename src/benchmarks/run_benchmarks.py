@@ -0,0 +1,300 @@
+import os
+import sys
+import json
+import time
+import random
+import platform
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from algorithms.kmp import kmp_search
+from algorithms.boyer_moore import BOYER_MOORE_VARIANTS
+from algorithms.ahocorasick import AhoCorasick, CompiledAhoCorasick
+from benchmarks.synthetic import WORDS_PER_DOC, synthetic_corpus
+from services.file_service import LazyCorpus
+from services.index_service import InvertedIndex
+from services.parallel_search import ParallelSearcher
+from services.search_service import search_keywords
+
+WORKDIR = os.path.join("data", "benchmarks")
+SCALES = {"10k": 10_000, "100k": 100_000}
+KEYWORD_LENGTHS = {"short": (3, 5), "medium": (6, 10), "long": (12, 20)}
+REGRESSION_THRESHOLD = 0.20
+
+
+def log(message):
+    # Progress ke stderr supaya stdout hanya berisi laporan JSON
+    print(message, file=sys.stderr)
+
+
+def _count_single(search_fn):
+    def run(texts, keywords):
+        return sum(len(search_fn(text, keyword)) for text in texts for keyword in keywords)
+    return run
+
+
+def _count_ac(texts, keywords):
+    automaton = AhoCorasick()
+    automaton.add_patterns(list(dict.fromkeys(keywords)))
+    return sum(sum(automaton.count_matches(text).values()) for text in texts)
+
+
+def _count_compiled_ac(texts, keywords):
+    automaton = CompiledAhoCorasick(list(dict.fromkeys(keywords)))
+    return sum(sum(automaton.count_matches(text).values()) for text in texts)
+
+
+# Setiap fungsi menghitung total kemunculan semua keyword di semua teks
+ALGORITHMS = {
+    "kmp": _count_single(kmp_search),
+    "bm-full": _count_single(BOYER_MOORE_VARIANTS["full"]),
+    "bm-horspool": _count_single(BOYER_MOORE_VARIANTS["horspool"]),
+    "bm-sunday": _count_single(BOYER_MOORE_VARIANTS["sunday"]),
+    "ac": _count_ac,
+    "ac-compiled": _count_compiled_ac,
+}
+
+
+def percentile(sorted_values, q):
+    """Persentil dengan interpolasi linear (q dalam 0-100) dari data yang sudah terurut."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(samples_ms):
+    values = sorted(samples_ms)
+    return {
+        "min": round(values[0], 3), "p50": round(percentile(values, 50), 3),
+        "p90": round(percentile(values, 90), 3), "p99": round(percentile(values, 99), 3),
+        "max": round(values[-1], 3), "mean": round(sum(values) / len(values), 3),
+    }
+
+
+def sample_keywords(texts, rng, count, length_range):
+    """
+    Mengambil keyword berupa potongan teks korpus dengan panjang pada length_range,
+    sehingga keyword pasti muncul minimal sekali (boleh berisi spasi seperti frasa).
+    """
+    keywords = []
+    while len(keywords) < count:
+        text = rng.choice(texts)
+        length = rng.randint(*length_range)
+        if len(text) <= length:
+            continue
+        start = rng.randrange(len(text) - length)
+        keyword = text[start:start + length].strip()
+        if len(keyword) >= length_range[0]:
+            keywords.append(keyword)
+    return keywords
+
+
+def load_corpora(args):
+    """Daftar (nama korpus, skew, korpus) sesuai --scales dan --skews."""
+    corpora = []
+    for scale in args.scales:
+        if scale == "real":
+            corpus = LazyCorpus(os.path.join("data", "pattern_matching"))
+            corpora.append(("real", None, corpus))
+        else:
+            for skew in args.skews:
+                log(f"Preparing synthetic corpus {scale} (skew={skew:g})")
+                corpus = synthetic_corpus(args.workdir, SCALES[scale], skew, args.seed, args.words_per_doc)
+                corpora.append((scale, skew, corpus))
+    return corpora
+
+
+def scenarios(args):
+    for keyword_count in args.keyword_counts:
+        for length_name in args.keyword_lengths:
+            yield keyword_count, length_name
+
+
+def scenario_rng(args, *parts):
+    """
+    RNG per korpus/skenario (seed string selalu deterministik), sehingga keyword
+    suatu skenario sama di setiap run walaupun skenario lain dipilih berbeda.
+    """
+    return random.Random(":".join(str(part) for part in (args.seed,) + parts))
+
+
+def bench_algorithms(corpus_name, skew, corpus, args):
+    """Algoritma pencarian langsung atas sampel dokumen korpus (tanpa search_keywords)."""
+    rng = scenario_rng(args, "algorithm", corpus_name, skew)
+    positions = rng.sample(range(len(corpus)), min(args.sample_docs, len(corpus)))
+    texts = [corpus[i][1] for i in positions]
+    sample_bytes = sum(len(text) for text in texts)
+    entries = []
+    for keyword_count, length_name in scenarios(args):
+        rng = scenario_rng(args, "algorithm", corpus_name, skew, keyword_count, length_name)
+        queries = [sample_keywords(texts, rng, keyword_count, KEYWORD_LENGTHS[length_name]) for _ in range(args.queries)]
+        for name in args.algorithms:
+            run = ALGORITHMS[name]
+            samples = []
+            for keywords in queries:
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    run(texts, keywords)
+                    samples.append((time.perf_counter() - start) * 1000)
+            stats = summarize(samples)
+            entries.append({
+                "suite": "algorithm", "corpus": corpus_name, "skew": skew, "name": name,
+                "keyword_count": keyword_count, "keyword_length": length_name,
+                "docs": len(texts), "bytes": sample_bytes, "samples": len(samples), "ms": stats,
+                "mb_per_s": round(sample_bytes / 1e6 / (stats["p50"] / 1000), 2) if stats["p50"] else None,
+            })
+            log(f"  [algorithm] {corpus_name:5} skew={skew} {name:12} kw={keyword_count:<3} {length_name:6} p50={stats['p50']:.1f}ms")
+    return entries
+
+
+def bench_search_modes(corpus_name, skew, corpus, args):
+    """search_keywords end-to-end (tanpa lookup nama ke database) untuk setiap mode pencarian."""
+    entries = []
+    build_start = time.perf_counter()
+    index = InvertedIndex.build(corpus)
+    build_ms = (time.perf_counter() - build_start) * 1000
+    entries.append({
+        "suite": "search", "corpus": corpus_name, "skew": skew, "name": "index-build",
+        "keyword_count": 0, "keyword_length": None, "docs": len(corpus), "samples": 1, "ms": summarize([build_ms]),
+    })
+    log(f"  [search]    {corpus_name:5} skew={skew} index-build {build_ms:.0f}ms")
+
+    modes = {
+        "index-top10": dict(index=index, max_results=10),
+        "index-all": dict(index=index, max_results=0),
+    }
+    scan_allowed = len(corpus) <= args.scan_limit
+    if scan_allowed:
+        for algorithm in ("kmp", "bm", "ac"):
+            modes[f"scan-{algorithm}"] = dict(algorithm=algorithm)
+    searcher = None
+    if scan_allowed and args.workers > 1:
+        searcher = ParallelSearcher(corpus, workers=args.workers, min_parallel_docs=0)
+        modes["parallel-kmp"] = dict(algorithm="kmp", searcher=searcher)
+
+    rng = scenario_rng(args, "search", corpus_name, skew)
+    texts = [corpus[i][1] for i in rng.sample(range(len(corpus)), min(args.sample_docs, len(corpus)))]
+    for keyword_count, length_name in scenarios(args):
+        rng = scenario_rng(args, "search", corpus_name, skew, keyword_count, length_name)
+        queries = [", ".join(sample_keywords(texts, rng, keyword_count, KEYWORD_LENGTHS[length_name]))
+                   for _ in range(args.queries)]
+        for mode, options in modes.items():
+            samples = []
+            for query in queries:
+                for _ in range(args.repeat):
+                    # Setiap run diukur tanpa cache substring dari query sebelumnya
+                    index.clear_cache()
+                    start = time.perf_counter()
+                    search_keywords(query, options.get("algorithm", "kmp"), options.get("max_results", 10), corpus,
+                                    options.get("index"), searcher=options.get("searcher"), attach_names=False)
+                    samples.append((time.perf_counter() - start) * 1000)
+            stats = summarize(samples)
+            entries.append({
+                "suite": "search", "corpus": corpus_name, "skew": skew, "name": mode,
+                "keyword_count": keyword_count, "keyword_length": length_name,
+                "docs": len(corpus), "samples": len(samples), "ms": stats,
+            })
+            log(f"  [search]    {corpus_name:5} skew={skew} {mode:12} kw={keyword_count:<3} {length_name:6} p50={stats['p50']:.1f}ms")
+    if not scan_allowed:
+        log(f"  [search]    {corpus_name:5} skew={skew} scan modes skipped ({len(corpus)} docs > --scan-limit {args.scan_limit})")
+    if searcher is not None:
+        searcher.close()
+    return entries
+
+
+def entry_key(entry):
+    return (entry["suite"], entry["corpus"], entry["skew"], entry["name"], entry["keyword_count"], entry["keyword_length"])
+
+
+def compare_with_baseline(report, baseline, threshold):
+    """
+    Membandingkan p50 setiap entri dengan baseline. Mengembalikan jumlah regresi
+    (p50 lebih lambat dari baseline lebih dari threshold).
+    """
+    baseline_entries = {entry_key(entry): entry for entry in baseline.get("results", [])}
+    regressions = 0
+    log(f"\nComparison with baseline ({baseline.get('meta', {}).get('timestamp', '?')}), threshold {threshold:.0%}:")
+    for entry in report["results"]:
+        base = baseline_entries.get(entry_key(entry))
+        if base is None or not base["ms"]["p50"]:
+            continue
+        ratio = entry["ms"]["p50"] / base["ms"]["p50"]
+        entry["baseline_p50"] = base["ms"]["p50"]
+        entry["change"] = round(ratio - 1, 4)
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            status = "improved"
+        else:
+            continue
+        log(f"  {status:10} {entry['suite']}/{entry['corpus']}/skew={entry['skew']}/{entry['name']} "
+              f"kw={entry['keyword_count']} {entry['keyword_length']}: {base['ms']['p50']:.1f}ms -> {entry['ms']['p50']:.1f}ms ({ratio - 1:+.0%})")
+    log(f"  {regressions} regression(s)")
+    return regressions
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark KMP, Boyer-Moore, Aho-Corasick and search_keywords modes")
+    parser.add_argument("--scales", nargs="+", default=["real", "10k"], choices=["real"] + list(SCALES),
+                        help="Corpora to run: the real data/pattern_matching corpus and/or synthetic ones (default: real 10k)")
+    parser.add_argument("--skews", nargs="+", type=float, default=[0.0, 1.0, 2.0],
+                        help="Alphabet skew (Zipf exponent over letters) for synthetic corpora (default: 0 1 2)")
+    parser.add_argument("--keyword-counts", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--keyword-lengths", nargs="+", default=list(KEYWORD_LENGTHS), choices=list(KEYWORD_LENGTHS))
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument("--suites", nargs="+", default=["algorithm", "search"], choices=["algorithm", "search"])
+    parser.add_argument("--queries", type=int, default=3, help="Random keyword sets per scenario (default: 3)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per keyword set (default: 3)")
+    parser.add_argument("--sample-docs", type=int, default=40, help="Documents scanned per algorithm sample (default: 40)")
+    parser.add_argument("--scan-limit", type=int, default=2000,
+                        help="Skip full-scan search modes on corpora larger than this (default: 2000)")
+    parser.add_argument("--workers", type=int, default=1, help="Also benchmark the parallel scan with this many workers")
+    parser.add_argument("--words-per-doc", type=int, default=WORDS_PER_DOC)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", default=WORKDIR, help="Where synthetic corpora are cached")
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative p50 slowdown counted as a regression (default: 0.20)")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "args": vars(args),
+        },
+        "results": [],
+    }
+
+    for corpus_name, skew, corpus in load_corpora(args):
+        log(f"Corpus {corpus_name} (skew={skew}): {len(corpus)} documents")
+        if "algorithm" in args.suites:
+            report["results"].extend(bench_algorithms(corpus_name, skew, corpus, args))
+        if "search" in args.suites:
+            report["results"].extend(bench_search_modes(corpus_name, skew, corpus, args))
+
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_with_baseline(report, json.load(f), args.threshold)
+        report["meta"]["regressions"] = regressions
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+        log(f"Report written to {args.output}")
+    else:
+        json.dump(report, sys.stdout, indent=1)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import os
+import random
+import string
+from typing import Iterator, List, Tuple
+
+from services.corpus_store import PackedCorpus, write_packed_documents
+
+VOCABULARY_SIZE = 5000
+WORDS_PER_DOC = 800
+
+
+def letter_weights(skew: float) -> List[float]:
+    """
+    Bobot huruf a-z mengikuti distribusi Zipf dengan eksponen skew.
+    skew = 0 berarti alfabet seragam; makin besar, makin sedikit huruf dominan.
+    """
+    return [1.0 / (rank ** skew) for rank in range(1, len(string.ascii_lowercase) + 1)]
+
+
+def make_vocabulary(rng: random.Random, skew: float, size: int = VOCABULARY_SIZE) -> List[str]:
+    weights = letter_weights(skew)
+    vocabulary = set()
+    while len(vocabulary) < size:
+        length = rng.randint(2, 12)
+        vocabulary.add("".join(rng.choices(string.ascii_lowercase, weights=weights, k=length)))
+    return sorted(vocabulary)
+
+
+def generate_documents(doc_count: int, skew: float, seed: int,
+                       words_per_doc: int = WORDS_PER_DOC) -> Iterator[Tuple[str, str]]:
+    """
+    Menghasilkan CV sintetis (filename, text) dengan format yang sama seperti
+    data/pattern_matching: huruf kecil, kata dipisah satu spasi. Frekuensi kata
+    mengikuti Zipf seperti teks alami. Hasil selalu sama untuk seed yang sama.
+    """
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng, skew)
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, len(vocabulary) + 1):
+        total += 1.0 / rank
+        cum_weights.append(total)
+    order = list(range(len(vocabulary)))
+    rng.shuffle(order)
+    ranked = [vocabulary[i] for i in order]
+
+    width = len(str(doc_count))
+    for i in range(doc_count):
+        length = max(1, int(rng.gauss(words_per_doc, words_per_doc / 4)))
+        words = rng.choices(ranked, cum_weights=cum_weights, k=length)
+        yield f"synthetic_{i:0{width}d}.txt", " ".join(words)
+
+
+def synthetic_corpus(workdir: str, doc_count: int, skew: float, seed: int,
+                     words_per_doc: int = WORDS_PER_DOC) -> PackedCorpus:
+    """
+    Korpus sintetis sebagai file packed di workdir (dibuat sekali lalu dipakai
+    ulang oleh run berikutnya dengan parameter yang sama).
+    """
+    path = os.path.join(workdir, f"synthetic_n{doc_count}_s{skew:g}_w{words_per_doc}_seed{seed}.pack")
+    if not os.path.exists(path):
+        write_packed_documents(generate_documents(doc_count, skew, seed, words_per_doc), path)
+    return PackedCorpus(path)
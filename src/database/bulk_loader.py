@@ -0,0 +1,101 @@
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from .db_backend import ApplicantBackend, cv_filename_from_path, get_backend, notify_applicants_changed
+except ImportError:
+    from db_backend import ApplicantBackend, cv_filename_from_path, get_backend, notify_applicants_changed
+
+# Jumlah baris per executemany; setiap batch di-commit sendiri
+BULK_BATCH_SIZE = 5000
+
+# (first_name, last_name, date_of_birth, address, phone_number)
+ApplicantRecord = Tuple[str, str, str, str, str]
+# (urutan pelamar di iterable applicants, 0-based; application_role; cv_path)
+ApplicationRecord = Tuple[int, Optional[str], str]
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def load_applicants(backend: ApplicantBackend, conn, applicants: Iterable[Sequence],
+                    batch_size: int = BULK_BATCH_SIZE) -> List[int]:
+    """
+    Insert ApplicantProfile per batch lewat executemany pada satu koneksi.
+    ID dibuat oleh database (AUTO_INCREMENT/rowid) selama table dikunci, lalu
+    dibaca sekaligus per batch tanpa lastrowid per baris. Mengembalikan
+    applicant_id sesuai urutan input.
+    """
+    query = """
+        INSERT INTO ApplicantProfile
+        (first_name, last_name, date_of_birth, address, phone_number)
+        VALUES (%s, %s, %s, %s, %s)
+    """
+    applicant_ids = []
+    for batch in _batches(applicants, batch_size):
+        applicant_ids.extend(backend._insert_returning_ids(conn, "ApplicantProfile", "applicant_id", query, batch))
+    return applicant_ids
+
+
+def load_applications(backend: ApplicantBackend, conn, applications: Iterable[Sequence],
+                      applicant_ids: Sequence[int], batch_size: int = BULK_BATCH_SIZE) -> int:
+    """
+    Insert ApplicationDetail per batch. Pelamar dirujuk dengan urutannya di
+    applicant_ids (hasil load_applicants); cv_filename diisi dari cv_path.
+    """
+    query = """
+        INSERT INTO ApplicationDetail
+        (applicant_id, application_role, cv_path, cv_filename)
+        VALUES (%s, %s, %s, %s)
+    """
+    count = 0
+    for batch in _batches(applications, batch_size):
+        rows = [(applicant_ids[applicant], role, cv_path, cv_filename_from_path(cv_path))
+                for applicant, role, cv_path in batch]
+        backend._executemany(conn, query, rows)
+        conn.commit()
+        count += len(rows)
+    return count
+
+
+def bulk_load(applicants: Iterable[ApplicantRecord], applications: Iterable[ApplicationRecord] = (),
+              batch_size: int = BULK_BATCH_SIZE, backend: Optional[ApplicantBackend] = None,
+              report: bool = True) -> Tuple[List[int], Dict[str, float]]:
+    """
+    Memuat data pelamar dalam jumlah besar dengan satu koneksi: semua applicants
+    lebih dulu, lalu applications yang merujuk pelamar lewat urutannya di
+    applicants. Batch yang sudah di-commit tetap tersimpan jika batch
+    berikutnya gagal. Mengembalikan (applicant_id sesuai urutan input, statistik).
+    """
+    backend = backend or get_backend()
+    start = time.perf_counter()
+    try:
+        with backend.connection() as conn:
+            applicant_ids = load_applicants(backend, conn, applicants, batch_size)
+            applicants_done = time.perf_counter()
+            application_count = load_applications(backend, conn, applications, applicant_ids, batch_size)
+    finally:
+        # Juga setelah gagal: batch yang sudah di-commit tetap tersimpan
+        notify_applicants_changed()
+    end = time.perf_counter()
+
+    rows = len(applicant_ids) + application_count
+    stats = {
+        "applicants": len(applicant_ids),
+        "applications": application_count,
+        "applicants_s": round(applicants_done - start, 3),
+        "applications_s": round(end - applicants_done, 3),
+        "elapsed_s": round(end - start, 3),
+        "rows_per_sec": round(rows / (end - start), 1) if end > start else 0.0,
+    }
+    if report:
+        print(f"Loaded {stats['applicants']} applicants and {stats['applications']} applications "
+              f"into {backend.name} in {stats['elapsed_s']:.2f}s ({stats['rows_per_sec']:,.0f} rows/s)")
+    return applicant_ids, stats
@@ -0,0 +1,372 @@
+import os
+import re
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .db_config import DB_BACKEND, DB_CONFIG, SQLITE_PATH
+except ImportError:
+    from db_config import DB_BACKEND, DB_CONFIG, SQLITE_PATH
+
+# Batas jumlah parameter per query IN (...)
+LOOKUP_BATCH_SIZE = 500
+
+SQLITE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS ApplicantProfile (
+        applicant_id INTEGER PRIMARY KEY,
+        first_name TEXT,
+        last_name TEXT,
+        date_of_birth TEXT,
+        address TEXT,
+        phone_number TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ApplicationDetail (
+        detail_id INTEGER PRIMARY KEY,
+        applicant_id INTEGER NOT NULL REFERENCES ApplicantProfile(applicant_id),
+        application_role TEXT,
+        cv_path TEXT,
+        cv_filename TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_cv_filename ON ApplicationDetail (cv_filename)",
+    "CREATE INDEX IF NOT EXISTS idx_detail_applicant ON ApplicationDetail (applicant_id)",
+]
+
+
+def cv_filename_from_path(cv_path):
+    """Key lookup CV: nama file tanpa folder dan tanpa ekstensi .pdf"""
+    return os.path.basename(cv_path).replace(".pdf", "")
+
+
+def notify_applicants_changed():
+    """
+    Dipanggil setelah data pelamar ditulis: cache nama/profil pelamar di
+    services.database_service dikosongkan jika modul itu sudah dimuat di proses
+    ini (modul ini bisa diimpor sebagai db_backend maupun database.db_backend).
+    """
+    database_service = sys.modules.get("services.database_service")
+    if database_service is not None:
+        database_service.clear_applicant_cache()
+
+
+def _profile_from_row(row, file_number):
+    return {
+        'applicant_id': row['applicant_id'],
+        'first_name': row['first_name'],
+        'last_name': row['last_name'],
+        'full_name': f"{row['first_name']} {row['last_name']}",
+        'date_of_birth': str(row['date_of_birth']),
+        'address': row['address'],
+        'phone_number': row['phone_number'],
+        'role': row['application_role'],
+        'cv_path': row['cv_path'],
+        'cv_filename': file_number
+    }
+
+
+class ApplicantBackend:
+    """
+    Query data pelamar yang sama untuk setiap database. Query ditulis dengan
+    placeholder %s; subclass hanya menyediakan koneksi dan placeholder-nya.
+    """
+
+    name = ""
+    placeholder = "%s"
+
+    @contextmanager
+    def connection(self):
+        raise NotImplementedError
+
+    def _execute(self, conn, query, params=()):
+        cursor = conn.cursor()
+        cursor.execute(query.replace("%s", self.placeholder), params)
+        return cursor
+
+    def _executemany(self, conn, query, rows) -> None:
+        cursor = conn.cursor()
+        try:
+            cursor.executemany(query.replace("%s", self.placeholder), rows)
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def _write_locked(self, conn, table: str):
+        """Transaksi yang memegang write lock table sampai commit/rollback."""
+        raise NotImplementedError
+
+    def _insert_returning_ids(self, conn, table: str, id_column: str, query: str, rows: list) -> range:
+        """
+        Insert rows (tanpa ID) dalam satu transaksi dan mengembalikan ID yang
+        dibuat database. Selama transaksi table dikunci untuk penulis lain,
+        sehingga AUTO_INCREMENT/rowid membagikan ID berurutan dan ID terakhir
+        cukup dibaca dengan MAX() sebelum commit.
+        """
+        with self._write_locked(conn, table):
+            self._executemany(conn, query, rows)
+            cursor = self._execute(conn, f"SELECT MAX({id_column}) FROM {table}")
+            try:
+                last_id = cursor.fetchone()[0]
+            finally:
+                cursor.close()
+            conn.commit()
+        return range(last_id - len(rows) + 1, last_id + 1)
+
+    def _fetch_dicts(self, conn, query, params=()) -> List[dict]:
+        cursor = self._execute(conn, query, params)
+        try:
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def get_applicant_names(self, cv_filenames: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """Nama file CV (tanpa ekstensi) -> (nama pelamar, role), satu query IN (...) per batch."""
+        cv_filenames = list(cv_filenames)
+        fetched = {}
+        with self.connection() as conn:
+            for start in range(0, len(cv_filenames), LOOKUP_BATCH_SIZE):
+                batch = cv_filenames[start:start + LOOKUP_BATCH_SIZE]
+                placeholders = ", ".join(["%s"] * len(batch))
+                query = f"""
+                SELECT ad.cv_filename AS cv_key, ap.first_name, ap.last_name, ad.application_role
+                FROM ApplicantProfile ap JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
+                WHERE ad.cv_filename IN ({placeholders});
+                """
+                for row in self._fetch_dicts(conn, query, tuple(batch)):
+                    if row['cv_key'] not in fetched:
+                        fetched[row['cv_key']] = (f"{row['first_name']} {row['last_name']}", row['application_role'])
+        return fetched
+
+    def load_applicant(self, file_number: str) -> dict:
+        """Detail lengkap pelamar berdasarkan nama file CV (tanpa ekstensi), {} jika tidak ada."""
+        query = """
+        SELECT
+            ap.applicant_id, ap.first_name, ap.last_name, ap.date_of_birth,
+            ap.address, ap.phone_number, ad.application_role, ad.cv_path
+        FROM ApplicantProfile ap
+        JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
+        WHERE ad.cv_filename = %s
+        LIMIT 1;
+        """
+        with self.connection() as conn:
+            rows = self._fetch_dicts(conn, query, (file_number,))
+        return _profile_from_row(rows[0], file_number) if rows else {}
+
+    def insert_applicant(self, first_name, last_name, dob, address, phone) -> int:
+        query = """
+            INSERT INTO ApplicantProfile
+            (first_name, last_name, date_of_birth, address, phone_number)
+            VALUES (%s, %s, %s, %s, %s)
+        """
+        with self.connection() as conn:
+            cursor = self._execute(conn, query, (first_name, last_name, dob, address, phone))
+            conn.commit()
+            applicant_id = cursor.lastrowid
+            cursor.close()
+        notify_applicants_changed()
+        return applicant_id
+
+    def insert_application_detail(self, applicant_id, role, cv_path) -> None:
+        query = """
+            INSERT INTO ApplicationDetail
+            (applicant_id, application_role, cv_path, cv_filename)
+            VALUES (%s, %s, %s, %s)
+        """
+        with self.connection() as conn:
+            cursor = self._execute(conn, query, (applicant_id, role, cv_path, cv_filename_from_path(cv_path)))
+            conn.commit()
+            cursor.close()
+        notify_applicants_changed()
+
+
+class MySQLBackend(ApplicantBackend):
+    """Server MySQL lewat connection pool bersama (database/db_pool.py)."""
+
+    name = "mysql"
+
+    def __init__(self, config: Optional[dict] = None):
+        self.config = dict(config or DB_CONFIG)
+
+    @contextmanager
+    def connection(self):
+        # Diimpor di sini supaya backend SQLite tetap jalan tanpa mysql-connector
+        try:
+            from .db_pool import get_pool
+        except ImportError as e:
+            # Fallback hanya jika modul ini diimpor tanpa package; error lain dari
+            # db_pool (misalnya mysql-connector belum terpasang) diteruskan apa adanya
+            if e.name is not None and e.name.split(".")[-1] != "db_pool":
+                raise
+            from db_pool import get_pool
+        with get_pool(self.config).connection() as conn:
+            yield conn
+
+    @contextmanager
+    def _write_locked(self, conn, table: str):
+        # SELECT ... FOR UPDATE tidak menahan insert AUTO_INCREMENT lain, jadi
+        # seluruh table dikunci; UNLOCK TABLES baru dijalankan setelah commit
+        cursor = self._execute(conn, f"LOCK TABLES {table} WRITE")
+        cursor.close()
+        try:
+            yield
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor = self._execute(conn, "UNLOCK TABLES")
+            cursor.close()
+
+
+class SQLiteBackend(ApplicantBackend):
+    """
+    Database SQLite lokal (satu file, tanpa server). Setiap thread memakai
+    koneksinya sendiri yang dibuka sekali; mode WAL membuat pembaca tidak
+    terblokir oleh penulis. Skema dan index dibuat otomatis jika belum ada.
+    """
+
+    name = "sqlite"
+    placeholder = "?"
+
+    def __init__(self, path: str = SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self.connection() as conn:
+            for statement in SQLITE_SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+
+    @contextmanager
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+
+    @contextmanager
+    def _write_locked(self, conn, table: str):
+        # BEGIN IMMEDIATE langsung mengambil write lock seluruh database
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def seed_from_sql(self, sql_path: str) -> Tuple[int, int]:
+        """
+        Mengisi database dari dump MySQL seperti tubes3_seeding.sql: hanya
+        statement INSERT yang dijalankan (sintaksnya sama di SQLite), lalu
+        cv_filename diisi dari cv_path. Data lama dihapus lebih dulu.
+        """
+        with open(sql_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        statements = re.findall(r"^INSERT INTO .*?;\s*$", content, flags=re.MULTILINE | re.DOTALL)
+        with self.connection() as conn:
+            with conn:
+                conn.execute("DELETE FROM ApplicationDetail")
+                conn.execute("DELETE FROM ApplicantProfile")
+                for statement in statements:
+                    conn.execute(statement)
+                rows = conn.execute("SELECT detail_id, cv_path FROM ApplicationDetail WHERE cv_filename IS NULL").fetchall()
+                conn.executemany("UPDATE ApplicationDetail SET cv_filename = ? WHERE detail_id = ?",
+                                 [(cv_filename_from_path(cv_path or ""), detail_id) for detail_id, cv_path in rows])
+            counts = tuple(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                           for table in ("ApplicantProfile", "ApplicationDetail"))
+        notify_applicants_changed()
+        return counts
+
+
+BACKENDS = {"mysql": MySQLBackend, "sqlite": SQLiteBackend}
+
+_backends: Dict[str, ApplicantBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name: Optional[str] = None) -> ApplicantBackend:
+    """
+    Backend bersama untuk proses ini, dipilih lewat DB_BACKEND di db_config
+    (environment variable SCOOPY_DB_BACKEND: mysql atau sqlite).
+    """
+    name = (name or DB_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown DB backend {name!r}, expected one of {', '.join(BACKENDS)}")
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = BACKENDS[name]()
+        return _backends[name]
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(round((len(sorted_values) - 1) * q / 100)))]
+
+
+def compare_latency(backend_names: List[str], rounds: int = 200) -> None:
+    """Latency load_applicant dan get_applicant_names (tanpa cache service) untuk setiap backend."""
+    import random
+    import time
+
+    for name in backend_names:
+        try:
+            backend = get_backend(name)
+            with backend.connection() as conn:
+                filenames = [row["cv_filename"] for row in
+                             backend._fetch_dicts(conn, "SELECT cv_filename FROM ApplicationDetail WHERE cv_filename IS NOT NULL")]
+        except Exception as e:
+            print(f"{name:7} unavailable: {e}")
+            continue
+        if not filenames:
+            print(f"{name:7} has no applicants, seed it first")
+            continue
+        rng = random.Random(42)
+        operations = {
+            "load_applicant": lambda: backend.load_applicant(rng.choice(filenames)),
+            "load_applicant (miss)": lambda: backend.load_applicant("no-such-cv"),
+            "get_applicant_names x10": lambda: backend.get_applicant_names(rng.sample(filenames, min(10, len(filenames)))),
+            "get_applicant_names all": lambda: backend.get_applicant_names(filenames),
+        }
+        for operation, run in operations.items():
+            samples = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                run()
+                samples.append((time.perf_counter() - start) * 1000)
+            samples.sort()
+            print(f"{name:7} {operation:24} p50 {_percentile(samples, 50):7.3f}ms  p90 {_percentile(samples, 90):7.3f}ms  "
+                  f"mean {sum(samples) / len(samples):7.3f}ms")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage and compare applicant database backends")
+    commands = parser.add_subparsers(dest="command", required=True)
+    init_parser = commands.add_parser("init-sqlite", help="Create the SQLite schema and indexes")
+    init_parser.add_argument("--seed", metavar="SQL_FILE", help="Load INSERT statements from a MySQL dump (e.g. src/database/tubes3_seeding.sql)")
+    compare_parser = commands.add_parser("compare", help="Compare lookup latency between backends")
+    compare_parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    compare_parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.command == "init-sqlite":
+        backend = get_backend("sqlite")
+        print(f"SQLite schema ready at {backend.path}")
+        if args.seed:
+            profiles, details = backend.seed_from_sql(args.seed)
+            print(f"Seeded {profiles} applicants and {details} applications from {args.seed}")
+    else:
+        compare_latency(args.backends, args.rounds)
@@ -1,3 +1,5 @@
+import os
+
 # Database configurations dengan fallback
 PRIMARY_DB_CONFIG = {
     "host": "localhost",
@@ -14,4 +16,14 @@ FALLBACK_DB_CONFIG = {
 }
 
 # Default configuration (akan digunakan jika tidak ada error)
-DB_CONFIG = PRIMARY_DB_CONFIG
\ No newline at end of file
+DB_CONFIG = PRIMARY_DB_CONFIG
+
+# Connection pool (bisa dioverride lewat environment variable)
+POOL_SIZE = int(os.environ.get("SCOOPY_DB_POOL_SIZE", 5))
+POOL_TIMEOUT = float(os.environ.get("SCOOPY_DB_POOL_TIMEOUT", 10))
+
+# Backend data pelamar: "mysql" (server di atas) atau "sqlite" (satu file lokal, tanpa server)
+DB_BACKEND = os.environ.get("SCOOPY_DB_BACKEND", "mysql")
+SQLITE_PATH = os.environ.get(
+    "SCOOPY_SQLITE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "applicants.db")
+)
@@ -0,0 +1,129 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+import mysql.connector
+
+try:
+    from .db_config import DB_CONFIG, POOL_SIZE, POOL_TIMEOUT
+except ImportError:
+    from db_config import DB_CONFIG, POOL_SIZE, POOL_TIMEOUT
+
+
+class PoolTimeoutError(Exception):
+    """Tidak ada koneksi yang bebas dalam batas waktu POOL_TIMEOUT."""
+
+
+class ConnectionPool:
+    """
+    Pool koneksi MySQL dengan ukuran terbatas. Koneksi idle dipakai ulang
+    (dicek dengan ping sebelum dipinjamkan), dan counter checkouts/waits/timeouts
+    bisa dibaca lewat stats() untuk monitoring.
+    """
+
+    def __init__(self, config=None, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.config = dict(config or DB_CONFIG)
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._counters = {
+            "checkouts": 0, "waits": 0, "timeouts": 0,
+            "created": 0, "discarded": 0, "in_use": 0,
+        }
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            self._counters[name] += delta
+
+    def _is_healthy(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        self._count("discarded")
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        if not self._slots.acquire(blocking=False):
+            self._count("waits")
+            if not self._slots.acquire(timeout=self.timeout):
+                self._count("timeouts")
+                raise PoolTimeoutError(f"No free connection after {self.timeout}s (pool size {self.size})")
+
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    conn = mysql.connector.connect(**self.config)
+                    self._count("created")
+                    break
+                if self._is_healthy(conn):
+                    break
+                self._discard(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+        self._count("checkouts")
+        self._count("in_use")
+        return conn
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+        except Exception:
+            self._discard(conn)
+        finally:
+            self._count("in_use", -1)
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._counters)
+        snapshot["idle"] = self._idle.qsize()
+        snapshot["size"] = self.size
+        return snapshot
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(config=None):
+    """
+    Mengambil pool bersama untuk konfigurasi database tertentu
+    (satu pool per kombinasi host/user/database dalam satu proses).
+    """
+    config = config or DB_CONFIG
+    key = tuple(sorted(config.items()))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(config)
+        return _pools[key]
@@ -1,5 +1,13 @@
+import argparse
+import glob
+import os
+import random
+
 from faker import Faker
 
+from bulk_loader import BULK_BATCH_SIZE, bulk_load
+from db_backend import BACKENDS, get_backend
+
 # Inisialisasi Faker
 fake = Faker()
 
@@ -7,23 +15,67 @@ fake = Faker()
 start_id = 200
 end_id = 230
 
+# Lokasi CV asli (data/<KATEGORI>/<nama>.pdf) yang dipakai sebagai cv_path
+CV_GLOB = os.path.join("data", "*", "*.pdf")
+
+
+def generate_applicant():
+    """Satu record (first_name, last_name, date_of_birth, address, phone_number)."""
+    return (
+        fake.first_name(),
+        fake.last_name(),
+        fake.date_of_birth(minimum_age=18, maximum_age=60).strftime('%Y-%m-%d'),
+        fake.address().replace("\n", ", "),
+        fake.phone_number()[:20],  # phone_number VARCHAR(20)
+    )
+
+
 # Fungsi untuk menghasilkan query SQL
 def generate_sql(start_id, end_id):
-    sql_query = "INSERT INTO ApplicantProfile (id, first_name, last_name, date_of_birth, address, phone_number) VALUES\n"
+    sql_query = "INSERT INTO ApplicantProfile (applicant_id, first_name, last_name, date_of_birth, address, phone_number) VALUES\n"
     values = []
-    
+
     for i in range(start_id, end_id + 1):
-        first_name = fake.first_name()
-        last_name = fake.last_name()
-        dob = fake.date_of_birth(minimum_age=18, maximum_age=60).strftime('%Y-%m-%d')
-        address = fake.address().replace("\n", ", ")
-        phone_number = fake.phone_number()
-        
+        first_name, last_name, dob, address, phone_number = (value.replace("'", "''") for value in generate_applicant())
         values.append(f"({i}, '{first_name}', '{last_name}', '{dob}', '{address}', '{phone_number}')")
-    
+
     sql_query += ",\n".join(values) + ";"
     return sql_query
 
-# Cetak hasilnya
-sql_output = generate_sql(start_id, end_id)
-print(sql_output)
+
+def generate_applications(count, per_applicant, cv_paths, rng):
+    """(urutan pelamar, role, cv_path) dengan role dari nama folder kategori CV."""
+    for applicant in range(count):
+        for _ in range(per_applicant):
+            cv_path = rng.choice(cv_paths)
+            role = os.path.basename(os.path.dirname(cv_path)).replace("-", " ").title()
+            yield applicant, role, cv_path.replace(os.sep, "/")
+
+
+def seed(count, per_applicant, batch_size, backend_name=None, seed_value=None):
+    """Membangkitkan count pelamar palsu dan memuatnya lewat bulk_loader."""
+    rng = random.Random(seed_value)
+    if seed_value is not None:
+        Faker.seed(seed_value)
+    cv_paths = sorted(glob.glob(CV_GLOB)) or [f"data/DUMMY/{i}.pdf" for i in range(count * per_applicant)]
+    applicants = (generate_applicant() for _ in range(count))
+    applications = generate_applications(count, per_applicant, cv_paths, rng)
+    return bulk_load(applicants, applications, batch_size, get_backend(backend_name))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate fake applicants: print INSERT SQL or bulk-load them into the database")
+    parser.add_argument("--count", type=int, default=0, help="Bulk-load this many applicants instead of printing SQL")
+    parser.add_argument("--applications", type=int, default=1, help="Applications (CVs) per applicant when bulk-loading")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE, help="Rows per executemany/commit")
+    parser.add_argument("--backend", choices=list(BACKENDS), help="Database backend (default: SCOOPY_DB_BACKEND)")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible data")
+    parser.add_argument("--start-id", type=int, default=start_id)
+    parser.add_argument("--end-id", type=int, default=end_id)
+    args = parser.parse_args()
+
+    if args.count > 0:
+        seed(args.count, args.applications, args.batch_size, args.backend, args.seed)
+    else:
+        # Cetak hasilnya
+        print(generate_sql(args.start_id, args.end_id))
@@ -1,9 +1,23 @@
 import fitz
 import re
 import os
+import sys
 import json
+import time
+import hashlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.corpus_store import PACKED_CORPUS_PATH, write_packed_corpus
+from services.database_service import clear_applicant_cache
+from services.file_service import clear_summary_cache, parse_cv_text_file, split_cv_sections
+from services.structured_store import STRUCTURED_DB_PATH, StructuredStore, import_json_files
+from services.index_service import INDEX_PATH, build_index_from_folder
+
+MANIFEST_PATH = os.path.join("data", "ingest_manifest.json")
+
 def extract_text_from_pdf(pdf_path):
     """Extract text from PDF"""
     try:
@@ -42,44 +56,260 @@ def extract_sections_flexible(text):
         result[header] = text[start:end].strip()
     return result
 
+def output_paths(pdf_path):
+    """Generated files for a PDF: pattern matching text and regex text (structured info lives in the store)"""
+    filename = os.path.splitext(os.path.basename(pdf_path))[0]
+    return [
+        f"data/pattern_matching/{filename}.txt",
+        f"data/regex_data/{filename}.txt",
+    ]
+
+def cv_name(pdf_path):
+    """Key of a PDF in the structured info store"""
+    return os.path.splitext(os.path.basename(pdf_path))[0]
+
+def file_sha256(path):
+    """Content hash of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest():
+    """Load the ingestion manifest (pdf_path -> size, mtime, sha256, role, outputs)"""
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except Exception as e:
+        print(f"⚠️  Could not read manifest {MANIFEST_PATH}: {e}")
+        return {}
+
+def save_manifest(manifest):
+    """Write the ingestion manifest atomically"""
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "files": manifest}, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+def plan_changes(jobs, manifest, full=False, stored=frozenset()):
+    """
+    Split jobs into changed and unchanged files.
+    Same size and mtime means unchanged; otherwise the content hash decides,
+    so a touched-but-identical PDF only gets its mtime refreshed.
+    A PDF whose outputs or structured record (stored names) are missing is changed.
+    """
+    changed = []
+    unchanged = set()
+    for pdf_path, role in jobs:
+        entry = manifest.get(pdf_path)
+        stat = os.stat(pdf_path)
+        if (full or not entry or entry.get("role") != role or cv_name(pdf_path) not in stored
+                or not all(os.path.exists(p) for p in output_paths(pdf_path))):
+            changed.append((pdf_path, role))
+        elif entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            unchanged.add(pdf_path)
+        elif entry["sha256"] == file_sha256(pdf_path):
+            entry["size"], entry["mtime"] = stat.st_size, stat.st_mtime
+            unchanged.add(pdf_path)
+        else:
+            changed.append((pdf_path, role))
+    return changed, unchanged
+
+def record_processed(manifest, pdf_path, role):
+    """Remember a successfully processed PDF in the manifest"""
+    stat = os.stat(pdf_path)
+    manifest[pdf_path] = {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "sha256": file_sha256(pdf_path),
+        "role": role,
+        "outputs": output_paths(pdf_path),
+    }
+
+def import_legacy_structured(store):
+    """Import data/structured_info/*.json written by older ingests, adding summary sections from regex_data"""
+    return import_json_files(store, summary_fn=lambda name: parse_cv_text_file(f"{name}.txt"))
+
+def open_store():
+    """Open the structured info store, importing the legacy JSON files on first use"""
+    store = StructuredStore(STRUCTURED_DB_PATH)
+    if len(store) == 0:
+        import_legacy_structured(store)
+    return store
+
+def remove_deleted(manifest, current_paths, scope_dirs):
+    """
+    Remove outputs and manifest entries of PDFs that no longer exist in scope_dirs.
+    Returns the structured record names that no remaining PDF uses.
+    """
+    deleted = [
+        pdf_path for pdf_path in manifest
+        if pdf_path not in current_paths and os.path.dirname(pdf_path) in scope_dirs and not os.path.exists(pdf_path)
+    ]
+    for pdf_path in deleted:
+        entry = manifest.pop(pdf_path)
+        still_used = {p for other in manifest.values() for p in other["outputs"]}
+        for output_path in entry["outputs"]:
+            if output_path not in still_used and os.path.exists(output_path):
+                os.remove(output_path)
+        print(f"🗑️  Removed outputs of deleted {pdf_path}")
+    still_named = {cv_name(pdf_path) for pdf_path in manifest}
+    return [cv_name(pdf_path) for pdf_path in deleted if cv_name(pdf_path) not in still_named]
+
 def process_single_file(pdf_path, role):
-    """Process single PDF file"""
+    """Process single PDF file, returns its structured info record (None if no text)"""
     filename = os.path.splitext(os.path.basename(pdf_path))[0]
     
     # Extract text from PDF
     text = extract_text_from_pdf(pdf_path)
     if not text.strip():
         print(f"⚠️  No text extracted from {pdf_path}")
-        return False
+        return None
+    
+    pattern_path, regex_path = output_paths(pdf_path)
     
     # Create output directories
     os.makedirs("data/pattern_matching", exist_ok=True)
     os.makedirs("data/regex_data", exist_ok=True)
-    os.makedirs("data/structured_info", exist_ok=True)
     
     # Save pattern matching text (cleaned)
-    save_pattern_text(text, f"data/pattern_matching/{filename}.txt")
+    save_pattern_text(text, pattern_path)
     
     # Save regex text (original)
-    save_regex_text(text, f"data/regex_data/{filename}.txt")
+    save_regex_text(text, regex_path)
     
-    # Extract sections and save as JSON
+    # Extract sections; the parent process writes the record to the structured info store
     sections = extract_sections_flexible(text)
     structured_info = {
         "filename": filename,
         "role": role,
         "sections": sections,
+        # Experience/Education/Skills untuk halaman summary, supaya tidak di-parse ulang saat dibuka
+        "summary_sections": split_cv_sections(text),
         "text_length": len(text),
         "processed_at": datetime.now().isoformat()
     }
     
-    with open(f"data/structured_info/{filename}.json", "w", encoding="utf-8") as jf:
-        json.dump(structured_info, jf, ensure_ascii=False, indent=2)
-    
     print(f"✓ Processed {filename} ({role}) - {len(text)} characters")
-    return True
+    return structured_info
+
+def process_single_file_isolated(pdf_path, role):
+    """Process single PDF file in a worker, never raising so one bad PDF can't stop the batch"""
+    try:
+        return process_single_file(pdf_path, role), None
+    except Exception as e:
+        print(f"❌ Failed {pdf_path}: {e}")
+        return None, str(e)
 
-def process_all_files():
+def _process_suspect(pdf_path, role):
+    """Re-run a job that was in flight when a worker crashed, alone in its own process"""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        try:
+            return executor.submit(process_single_file_isolated, pdf_path, role).result()[0]
+        except BrokenProcessPool:
+            print(f"❌ Worker crashed on {pdf_path}, skipping")
+            return None
+
+def process_files_parallel(jobs, workers=None, max_pending=None):
+    """
+    Process (pdf_path, role) jobs across worker processes.
+    At most max_pending jobs are queued at once. If a worker process crashes,
+    the jobs that were in flight are re-run one by one in isolation so only the
+    offending PDF fails, then the batch continues in a fresh pool.
+    Returns {pdf_path: structured info record or None}.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    outcomes = {}
+    queue = list(reversed(jobs))
+    
+    while queue:
+        pending = {}
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            while queue or pending:
+                while queue and len(pending) < max_pending:
+                    pdf_path, role = queue.pop()
+                    pending[executor.submit(process_single_file_isolated, pdf_path, role)] = (pdf_path, role)
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pdf_path, _ = pending[future]
+                    outcomes[pdf_path] = future.result()[0]
+                    del pending[future]
+        except BrokenProcessPool:
+            for pdf_path, role in pending.values():
+                outcomes[pdf_path] = _process_suspect(pdf_path, role)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    return outcomes
+
+def print_throughput(files, total_bytes, elapsed):
+    """Print ingestion throughput"""
+    elapsed = max(elapsed, 1e-9)
+    print(f"   Elapsed: {elapsed:.2f}s")
+    print(f"   Throughput: {files / elapsed:.2f} files/sec, {total_bytes / elapsed / (1024 * 1024):.2f} MB/sec")
+
+def run_jobs(jobs, workers=1):
+    """Process (pdf_path, role) jobs serially or in parallel, returns {pdf_path: record or None}"""
+    if workers > 1:
+        return process_files_parallel(jobs, workers)
+    return {pdf_path: process_single_file_isolated(pdf_path, role)[0] for pdf_path, role in jobs}
+
+def ingest(role_jobs, scope_dirs, workers=1, full=False):
+    """
+    Incrementally ingest {role: [(pdf_path, role), ...]}: only new or changed PDFs
+    are processed and outputs of PDFs deleted from scope_dirs are removed.
+    Structured info records of the batch are written to the store in one transaction.
+    Returns (total files, processed, unchanged, removed).
+    """
+    start_time = time.perf_counter()
+    manifest = load_manifest()
+    all_jobs = [job for jobs in role_jobs.values() for job in jobs]
+    store = open_store()
+    
+    changed, unchanged = plan_changes(all_jobs, manifest, full, set(store.filenames()))
+    if workers > 1 and changed:
+        print(f"\n⚡ Processing {len(changed)} changed files with {workers} workers:")
+    outcomes = run_jobs(changed, workers)
+    records = []
+    for pdf_path, role in changed:
+        if outcomes.get(pdf_path):
+            records.append(outcomes[pdf_path])
+            record_processed(manifest, pdf_path, role)
+    
+    removed_names = remove_deleted(manifest, {pdf_path for pdf_path, _ in all_jobs}, scope_dirs)
+    removed = len(removed_names)
+    store.write(records, deleted=removed_names)
+    store.close()
+    save_manifest(manifest)
+    
+    total_processed = 0
+    for role, jobs in role_jobs.items():
+        role_processed = sum(1 for pdf_path, _ in jobs if outcomes.get(pdf_path))
+        role_unchanged = sum(1 for pdf_path, _ in jobs if pdf_path in unchanged)
+        total_processed += role_processed
+        print(f"   ✅ {role}: {role_processed}/{len(jobs) - role_unchanged} files processed ({role_unchanged} unchanged)")
+    
+    processed_bytes = sum(os.path.getsize(pdf_path) for pdf_path, _ in changed)
+    print_throughput(len(changed), processed_bytes, time.perf_counter() - start_time)
+    
+    if any(outcomes.values()) or removed or not os.path.exists(INDEX_PATH) or not os.path.exists(PACKED_CORPUS_PATH):
+        build_index_from_folder()
+        write_packed_corpus()
+    
+    # New CVs may belong to applicants that were looked up (and missing) before,
+    # and summaries cached in this process may come from the old store contents
+    clear_applicant_cache()
+    clear_summary_cache()
+    return len(all_jobs), total_processed, len(unchanged), removed
+
+def process_all_files(workers=1, full=False):
     """Process all PDF files in all role folders"""
     base_data_dir = "data"
     
@@ -92,9 +322,8 @@ def process_all_files():
         'SALES', 'TEACHER'
     ]
     
-    total_processed = 0
-    total_files = 0
-    
+    # Collect jobs per role
+    role_jobs = {}
     for role in roles:
         role_dir = os.path.join(base_data_dir, role)
         
@@ -107,33 +336,26 @@ def process_all_files():
         
         if not pdf_files:
             print(f"⚠️  No PDF files found in {role_dir}")
-            continue
-        
-        print(f"\n📁 Processing {role} ({len(pdf_files)} files):")
         
-        role_processed = 0
-        for pdf_file in sorted(pdf_files):
-            pdf_path = os.path.join(role_dir, pdf_file)
-            total_files += 1
-            
-            if process_single_file(pdf_path, role):
-                role_processed += 1
-                total_processed += 1
-        
-        print(f"   ✅ {role}: {role_processed}/{len(pdf_files)} files processed")
+        role_jobs[role] = [(os.path.join(role_dir, pdf_file), role) for pdf_file in sorted(pdf_files)]
+    
+    scope_dirs = {os.path.join(base_data_dir, role) for role in roles}
+    total_files, total_processed, total_unchanged, removed = ingest(role_jobs, scope_dirs, workers, full)
     
     print(f"\n🎉 SUMMARY:")
     print(f"   Total files found: {total_files}")
     print(f"   Successfully processed: {total_processed}")
-    print(f"   Failed: {total_files - total_processed}")
+    print(f"   Unchanged (skipped): {total_unchanged}")
+    print(f"   Failed: {total_files - total_processed - total_unchanged}")
+    print(f"   Removed (deleted PDFs): {removed}")
     
     # Display output structure
     print(f"\n📂 Output directories created:")
     print(f"   - data/pattern_matching/ (cleaned text for pattern matching)")
     print(f"   - data/regex_data/ (original text for regex)")
-    print(f"   - data/structured_info/ (JSON with extracted sections)")
+    print(f"   - data/structured_info.db (SQLite store with extracted sections)")
 
-def process_specific_role(role_name):
+def process_specific_role(role_name, workers=1, full=False):
     """Process files from specific role only"""
     base_data_dir = "data"
     role_dir = os.path.join(base_data_dir, role_name.upper())
@@ -146,26 +368,31 @@ def process_specific_role(role_name):
     
     if not pdf_files:
         print(f"⚠️  No PDF files found in {role_dir}")
-        return
     
     print(f"📁 Processing {role_name} ({len(pdf_files)} files):")
     
-    processed = 0
-    for pdf_file in sorted(pdf_files):
-        pdf_path = os.path.join(role_dir, pdf_file)
-        if process_single_file(pdf_path, role_name):
-            processed += 1
-    
-    print(f"✅ {role_name}: {processed}/{len(pdf_files)} files processed")
+    jobs = [(os.path.join(role_dir, pdf_file), role_name) for pdf_file in sorted(pdf_files)]
+    ingest({role_name: jobs}, {role_dir}, workers, full)
 
 if __name__ == "__main__":
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Extract CV PDFs into pattern matching, regex and structured data")
+    parser.add_argument("role", nargs="?", help="Only process this role folder")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes (default: 1, serial)")
+    parser.add_argument("--full", action="store_true", help="Reprocess every PDF, ignoring the manifest")
+    parser.add_argument("--import-structured", action="store_true",
+                        help="Only import legacy data/structured_info/*.json into data/structured_info.db")
+    args = parser.parse_args()
     
-    if len(sys.argv) > 1:
+    if args.import_structured:
+        store = StructuredStore(STRUCTURED_DB_PATH)
+        import_legacy_structured(store)
+        store.close()
+    elif args.role:
         # Process specific role if provided as argument
-        role_name = sys.argv[1]
-        process_specific_role(role_name)
+        process_specific_role(args.role, args.workers, args.full)
     else:
         # Process all files
         print("🚀 Starting extraction for all PDF files...")
-        process_all_files()
\ No newline at end of file
+        process_all_files(args.workers, args.full)
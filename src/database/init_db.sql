@@ -14,7 +14,9 @@ CREATE TABLE ApplicationDetail (
     applicant_id INT NOT NULL,
     application_role VARCHAR(100) DEFAULT NULL,
     cv_path TEXT,
-    FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id)
+    cv_filename VARCHAR(255) DEFAULT NULL,
+    FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id),
+    INDEX idx_cv_filename (cv_filename)
 );
 -- Clear existing data
 DELETE FROM ApplicationDetail;
@@ -677,4 +679,9 @@ INSERT INTO ApplicationDetail (applicant_id, application_role, cv_path) VALUES
 (77, 'Teacher', 'data/TEACHER/16210888.pdf'),
 (78, 'Teacher', 'data/TEACHER/16270906.pdf'),
 (79, 'Teacher', 'data/TEACHER/16820422.pdf'),
-(80, 'Teacher', 'data/TEACHER/17311685.pdf');
\ No newline at end of file
+(80, 'Teacher', 'data/TEACHER/17311685.pdf');
+
+-- Isi key nama file CV (tanpa folder dan ekstensi .pdf) untuk lookup ber-index
+UPDATE ApplicationDetail
+SET cv_filename = REPLACE(SUBSTRING_INDEX(cv_path, '/', -1), '.pdf', '')
+WHERE cv_filename IS NULL;
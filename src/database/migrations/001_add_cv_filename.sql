@@ -0,0 +1,15 @@
+-- Menambahkan key nama file CV yang ter-index ke ApplicationDetail.
+-- Lookup berdasarkan nama file sebelumnya memakai
+-- REPLACE(SUBSTRING_INDEX(cv_path, '/', -1), '.pdf', '') sehingga selalu full scan.
+--
+-- Jalankan sekali untuk database yang sudah ada:
+--   mysql -u ats_user -p tubes3_seeding < src/database/migrations/001_add_cv_filename.sql
+
+ALTER TABLE ApplicationDetail
+    ADD COLUMN cv_filename VARCHAR(255) DEFAULT NULL;
+
+UPDATE ApplicationDetail
+SET cv_filename = REPLACE(SUBSTRING_INDEX(cv_path, '/', -1), '.pdf', '')
+WHERE cv_filename IS NULL;
+
+CREATE INDEX idx_cv_filename ON ApplicationDetail (cv_filename);
@@ -1,15 +1,62 @@
 import flet as ft
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from services.search_service import search_keywords
-from services.file_service import load_cv_text_files
+from services.search_service import SearchCancelled, search_keywords
+from services.file_service import load_lazy_corpus
+from services.index_service import load_index_for
+from services.parallel_search import ParallelSearcher
+from services.result_cache import shared_result_cache
+from services.instrumentation import Trace
+from services.search_client import client_from_env
 from gui.summary import create_summary_page, load_applicant_by_exact_filename_from_db
 from gui.pdf_view import show_cv_threaded
 
+# Korpus, index, dan ParallelSearcher dimuat sekali per proses dan dipakai
+# bersama semua sesi Flet (bukan satu pool proses per halaman yang dibuka)
+_search_state = None
+_search_state_lock = threading.Lock()
+
+def get_search_state():
+    """(pattern_files, index, searcher) milik proses ini, dimuat saat pertama kali dibutuhkan."""
+    global _search_state
+    with _search_state_lock:
+        if _search_state is None:
+            startup_trace = Trace("startup")
+            with startup_trace.span("load"):
+                pattern_files = load_lazy_corpus() or []
+            with startup_trace.span("index_load"):
+                index = load_index_for(pattern_files)
+            with startup_trace.span("searcher_start"):
+                searcher = ParallelSearcher(pattern_files) if index is None else None
+            startup_trace.count("documents", len(pattern_files))
+            startup_trace.emit()
+            _search_state = (pattern_files, index, searcher)
+        return _search_state
+
+def close_search_state():
+    """Menghentikan proses worker ParallelSearcher, dipanggil saat aplikasi ditutup."""
+    global _search_state
+    with _search_state_lock:
+        if _search_state is not None and _search_state[2] is not None:
+            _search_state[2].close()
+        _search_state = None
+
 def create_search_cv_page(page: ft.Page):
-    pattern_files = load_cv_text_files()
+    # Jika $SCOOPY_SEARCH_URL di-set, pencarian dilayani server (src/server.py) tanpa memuat korpus di sini
+    search_client = client_from_env()
+    pattern_files, index, searcher = [], None, None
+    if search_client is None:
+        pattern_files, index, searcher = get_search_state()
+    result_cache = shared_result_cache()
     selected_algorithm = "KMP"
     has_searched = False
+    # Pencarian berjalan di thread terpisah supaya UI tetap responsif
+    search_executor = ThreadPoolExecutor(max_workers=1)
+    cancel_event = None
+    last_render_time = 0.0
 
     keywords_field = ft.TextField(
         hint_text="Enter your keywords (comma separated)...",
@@ -83,7 +130,8 @@ def create_search_cv_page(page: ft.Page):
         page.update()
 
     def update_results_display(search_data):
-        nonlocal has_searched
+        nonlocal has_searched, cancel_event
+        cancel_event = None
         results_container.controls.clear()
         
         results = search_data["results"]
@@ -91,6 +139,20 @@ def create_search_cv_page(page: ft.Page):
         fuzzy_time_ms = search_data["fuzzy_time_ms"]
         cv_count = search_data["cv_count"]
         
+        timing_lines = [
+            ft.Text(f"Exact Match: {cv_count} CVs scanned in {exact_time_ms}ms.", size=16, color="#8B4513"),
+            ft.Text(f"Fuzzy Match: {cv_count if fuzzy_time_ms > 0 else 0} CVs scanned in {fuzzy_time_ms}ms.", size=16, color="#8B4513")
+        ]
+        if search_data.get("cache_hit"):
+            timing_lines.append(ft.Text(f"Served from cache in {search_data['cache_time_ms']}ms (timings above are from the original scan).", size=16, color="#2E7D32"))
+        phase_totals = {}
+        for span in search_data.get("trace", {}).get("spans", []):
+            if span["depth"] == 1:
+                phase_totals[span["name"]] = phase_totals.get(span["name"], 0) + span["duration_us"]
+        if phase_totals:
+            breakdown = ", ".join(f"{name} {duration_us / 1000:.1f}ms" for name, duration_us in phase_totals.items())
+            timing_lines.append(ft.Text(f"Breakdown: {breakdown}", size=13, color="#A08C7D"))
+        
         if results:
             header = ft.Column(
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=5,
@@ -106,10 +168,7 @@ def create_search_cv_page(page: ft.Page):
                             ft.Container(height=2, bgcolor="#5D2E0A", width=200),
                         ]
                     ),
-                    ft.Column([
-                        ft.Text(f"Exact Match: {cv_count} CVs scanned in {exact_time_ms}ms.", size=16, color="#8B4513"),
-                        ft.Text(f"Fuzzy Match: {cv_count if fuzzy_time_ms > 0 else 0} CVs scanned in {fuzzy_time_ms}ms.", size=16, color="#8B4513")
-                    ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=5)
+                    ft.Column(timing_lines, horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=5)
                 ]
             )
             grid = ft.Row([create_result_card(result) for result in results], alignment=ft.MainAxisAlignment.CENTER, wrap=True, spacing=20, run_spacing=20)
@@ -129,8 +188,77 @@ def create_search_cv_page(page: ft.Page):
         search_button.disabled = False
         page.update()
     
+    def set_search_button_busy(text, disabled=False):
+        search_button.disabled = disabled
+        search_button.content = ft.Row(
+            [ft.ProgressRing(width=20, height=20, stroke_width=2.5, color="white"),
+             ft.Text(text, size=20, weight=ft.FontWeight.W_600, color="white")],
+            alignment=ft.MainAxisAlignment.CENTER, spacing=15
+        )
+
+    def show_partial_results(phase, scanned, total, partial_results, max_results_value):
+        nonlocal last_render_time
+        now = time.monotonic()
+        if now - last_render_time < 0.2 and scanned < total:
+            return
+        last_render_time = now
+
+        top_results = sorted(partial_results, key=lambda x: x["total_matches"], reverse=True)
+        if max_results_value > 0:
+            top_results = top_results[:max_results_value]
+        phase_text = "Exact" if phase == "exact" else "Fuzzy"
+        results_container.controls = [
+            ft.Text(f"{phase_text} Match: {scanned}/{total} CVs scanned, {len(partial_results)} matching so far...", size=16, color="#8B4513"),
+            ft.Container(height=20),
+            ft.Row([create_result_card(result) for result in top_results], alignment=ft.MainAxisAlignment.CENTER, wrap=True, spacing=20, run_spacing=20),
+        ]
+        set_search_button_busy(f"Searching {scanned}/{total}... (click to cancel)")
+        page.update()
+
+    def run_search(keywords, algorithm, max_results_value, event):
+        trace = Trace("search", query=keywords, algorithm=algorithm, max_results=max_results_value)
+        try:
+            if search_client is not None:
+                with trace.span("remote"):
+                    search_data = search_client.search(keywords, algorithm, max_results_value)
+                # Request HTTP tidak bisa dihentikan di tengah jalan; hasilnya diabaikan jika sudah dibatalkan
+                if event.is_set():
+                    raise SearchCancelled()
+            else:
+                search_data = search_keywords(
+                    keywords, algorithm, max_results_value, pattern_files, index, searcher=searcher,
+                    progress=lambda *args: show_partial_results(*args, max_results_value), cancel_event=event,
+                    cache=result_cache, trace=trace,
+                )
+        except SearchCancelled:
+            show_cancelled()
+            return
+        except Exception as ex:
+            print(f"Search error: {ex}")
+            show_cancelled(f"Search failed: {ex}")
+            return
+        with trace.span("render"):
+            update_results_display(search_data)
+        trace.emit()
+
+    def show_cancelled(message="Search cancelled"):
+        nonlocal cancel_event
+        cancel_event = None
+        results_container.controls = [ft.Text(message, size=24, color="#5D2E0A")]
+        search_button.content = None
+        search_button.text = "Search CV"
+        search_button.bgcolor = "#8B4513"
+        search_button.disabled = False
+        page.update()
+
     def on_search_click(e):
-        nonlocal has_searched
+        nonlocal has_searched, cancel_event, last_render_time
+        if cancel_event is not None:
+            cancel_event.set()
+            set_search_button_busy("Cancelling...", disabled=True)
+            page.update()
+            return
+
         if has_searched:
             reset_search_state()
             return
@@ -139,17 +267,14 @@ def create_search_cv_page(page: ft.Page):
             page.open(ft.SnackBar(content=ft.Text("Please enter keywords to search!")))
             return
 
-        search_button.disabled = True
-        search_button.content = ft.Row(
-            [ft.ProgressRing(width=20, height=20, stroke_width=2.5, color="white"),
-             ft.Text("Searching, please wait...", size=20, weight=ft.FontWeight.W_600, color="white")],
-            alignment=ft.MainAxisAlignment.CENTER, spacing=15
-        )
+        cancel_event = threading.Event()
+        last_render_time = 0.0
+        set_search_button_busy("Searching... (click to cancel)")
+        results_container.controls.clear()
         page.update()
             
         max_results_value = int(results_input.value) if results_input.value.strip().isdigit() else 10
-        search_data = search_keywords(keywords_field.value, selected_algorithm.lower(), max_results_value, pattern_files)
-        update_results_display(search_data)
+        search_executor.submit(run_search, keywords_field.value, selected_algorithm.lower(), max_results_value, cancel_event)
     
     def create_result_card(result):
         match_type = result.get("match_type", "exact")
@@ -194,7 +319,7 @@ def create_search_cv_page(page: ft.Page):
                             alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                             controls=[
                                 ft.Column([
-                                    ft.Text(result.get("name", "Unknown"), size=20, weight=ft.FontWeight.BOLD, color="#5D2E0A"),
+                                    ft.Text(result.get("name") or result["filename"], size=20, weight=ft.FontWeight.BOLD, color="#5D2E0A"),
                                     ft.Text(f"{result.get('total_matches', 0)} total matches", size=14, color="#5D2E0A"),
                                 ]),
                                 ft.Container(
@@ -3,7 +3,7 @@ import re
 import os
 
 from services.database_service import load_applicant_by_exact_filename_from_db
-from services.file_service import parse_cv_text_file
+from services.file_service import load_summary_sections
 
 def create_summary_page(result: dict, on_back_click=None):
     """
@@ -12,7 +12,7 @@ def create_summary_page(result: dict, on_back_click=None):
     path_without_extension = os.path.splitext(result["filename"])[0]
 
     profile_data = load_applicant_by_exact_filename_from_db(path_without_extension)
-    cv_content = parse_cv_text_file(result["filename"])
+    cv_content = load_summary_sections(result["filename"])
 
     full_name = profile_data.get("full_name", "Unknown Applicant")
     date_of_birth = profile_data.get("date_of_birth", "N/A")
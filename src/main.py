@@ -1,5 +1,6 @@
 import flet as ft
 from gui.landing_page import create_landing_page
+from gui.search_cv import close_search_state
 
 def main(page: ft.Page):
     page.fonts = {
@@ -16,5 +17,8 @@ def main(page: ft.Page):
     page.add(welcome_view)
 
 if __name__ == "__main__":
-    ft.app(target=main, assets_dir="assets")
+    try:
+        ft.app(target=main, assets_dir="assets")
+    finally:
+        close_search_state()
 
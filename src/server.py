@@ -0,0 +1,297 @@
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from services.database_service import get_applicant_names_by_cvs
+from services.file_service import CORPUS_CACHE_BYTES
+from services import search_worker
+from services.result_cache import ResultCache, corpus_version, make_key
+from services.search_worker import init_worker, load_worker_state, refresh_worker_state, run_query
+
+ALGORITHMS = ["kmp", "bm", "ac"]
+MAX_BODY_BYTES = 64 * 1024
+# Batas waktu membaca setiap baris header dan body request
+READ_TIMEOUT = 10.0
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_search_request(fields):
+    """Validasi parameter /search (dari body JSON atau query string) menjadi query untuk run_query."""
+    keywords = fields.get("keywords")
+    if not isinstance(keywords, str) or not keywords.strip():
+        raise HttpError(400, "\"keywords\" must be a non-empty string")
+    algorithm = str(fields.get("algorithm", "kmp")).lower()
+    if algorithm not in ALGORITHMS:
+        raise HttpError(400, f"\"algorithm\" must be one of {', '.join(ALGORITHMS)}")
+    try:
+        max_results = int(fields.get("max_results", 10))
+        max_distance = int(fields.get("max_distance", 1))
+    except (TypeError, ValueError):
+        raise HttpError(400, "\"max_results\" and \"max_distance\" must be integers")
+    return {"keywords": keywords, "algorithm": algorithm, "max_results": max_results, "max_distance": max_distance}
+
+
+def _flag(value):
+    return value in (True, 1, "1", "true", "yes")
+
+
+def attach_applicant_names(results):
+    names = get_applicant_names_by_cvs([result["filename"] for result in results])
+    for result in results:
+        result["name"], result["role"] = names[result["filename"]]
+
+
+class SearchServer:
+    """
+    Server HTTP/JSON di atas asyncio yang berbagi satu korpus dan index untuk
+    semua client. Pencarian (CPU-bound) dijalankan di ProcessPoolExecutor yang
+    worker-nya mewarisi korpus/index yang sudah dimuat parent. Paling banyak
+    max_pending pencarian boleh berjalan atau mengantre; request berikutnya
+    langsung ditolak dengan 503. Request yang melewati timeout dijawab 504
+    (pencarian yang sudah berjalan di worker tetap diselesaikan lalu dibuang).
+    Hasil disimpan di satu ResultCache milik server, sehingga query berulang
+    dari client mana pun dijawab tanpa mengirim pekerjaan ke worker. Cache
+    tidak menyimpan nama pelamar: nama diambil dari DB (di thread terpisah)
+    untuk setiap response. Jika korpus di disk berubah, worker memuat ulang
+    korpusnya sendiri sebelum query berikutnya dan state parent dimuat ulang
+    di background untuk /health dan kunci cache. Jika proses worker mati, pool
+    dibuat ulang lewat executor_factory dan query dikirim ulang sekali.
+    """
+
+    def __init__(self, executor_factory, workers, max_pending, timeout, cache=None):
+        self.executor_factory = executor_factory
+        self.executor = executor_factory()
+        self.cache = cache
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.in_flight = 0
+        self.reload_lock = asyncio.Lock()
+        self.started_at = time.time()
+        self.counters = {"requests": 0, "searches": 0, "rejected": 0, "timeouts": 0, "errors": 0, "restarts": 0}
+
+    def health(self):
+        return {
+            "status": "ok", **search_worker.worker_info(), "workers": self.workers,
+            "in_flight": self.in_flight, "max_pending": self.max_pending, "timeout_s": self.timeout,
+            "uptime_s": round(time.time() - self.started_at, 1), **self.counters,
+            "result_cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    async def refresh_state(self):
+        """Memuat ulang korpus parent (di thread terpisah) jika versinya berubah."""
+        if corpus_version() == search_worker.worker_info()["corpus_version"]:
+            return
+        async with self.reload_lock:
+            await asyncio.get_running_loop().run_in_executor(None, refresh_worker_state)
+
+    def restart_executor(self, broken):
+        """Mengganti pool yang rusak (worker mati) dengan pool baru, sekali per pool yang rusak."""
+        if self.executor is not broken:
+            return
+        print("Search worker died, restarting the worker pool")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.executor = self.executor_factory()
+        self.counters["restarts"] += 1
+
+    async def run_in_worker(self, query, trace):
+        # Query dikirim ulang sekali ke pool baru; jika pool baru juga rusak, request dijawab 503
+        for attempt in range(2):
+            executor = self.executor
+            future = None
+            try:
+                future = executor.submit(run_query, query, False, trace)
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            except asyncio.TimeoutError:
+                future.cancel()
+                self.counters["timeouts"] += 1
+                raise HttpError(504, f"Search did not finish within {self.timeout:g}s")
+            except BrokenProcessPool:
+                self.restart_executor(executor)
+        raise HttpError(503, "Search workers crashed and were restarted, retry later")
+
+    async def finish(self, record, attach_names):
+        if attach_names:
+            await asyncio.get_running_loop().run_in_executor(None, attach_applicant_names, record["results"])
+        return record
+
+    async def search(self, fields):
+        query = parse_search_request(fields)
+        attach_names = not _flag(fields.get("skip_names"))
+        trace = _flag(fields.get("trace"))
+        await self.refresh_state()
+        lookup_start = time.perf_counter()
+        keywords = [kw.strip().lower() for kw in query["keywords"].split(",") if kw.strip()]
+        cache_key = json.dumps([make_key(keywords, query["max_distance"], search_worker.worker_info()["cv_count"]),
+                                query["max_results"], trace])
+        cached = self.cache.get(cache_key) if self.cache is not None else None
+        if cached is not None:
+            cached.update(cache_hit=True, cache_time_ms=int((time.perf_counter() - lookup_start) * 1000))
+            return await self.finish(cached, attach_names)
+        if self.in_flight >= self.max_pending:
+            self.counters["rejected"] += 1
+            raise HttpError(503, f"Server busy ({self.in_flight} searches pending), retry later")
+        version = corpus_version()
+        self.in_flight += 1
+        try:
+            record = await self.run_in_worker(query, trace)
+        finally:
+            self.in_flight -= 1
+        self.counters["searches"] += 1
+        if "error" in record:
+            self.counters["errors"] += 1
+            raise HttpError(500, record["error"])
+        record["cache_hit"] = False
+        # Hasil yang dihitung saat korpus sedang berganti tidak disimpan di bawah versi baru
+        if self.cache is not None and corpus_version() == version:
+            self.cache.put(cache_key, record)
+        return await self.finish(record, attach_names)
+
+    async def route(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == "/health":
+            if method != "GET":
+                raise HttpError(405, "Use GET /health")
+            return self.health()
+        if url.path == "/search":
+            if method == "POST":
+                try:
+                    fields = json.loads(body or b"{}")
+                except ValueError as e:
+                    raise HttpError(400, f"Invalid JSON body: {e}")
+                if not isinstance(fields, dict):
+                    raise HttpError(400, "JSON body must be an object")
+            elif method == "GET":
+                fields = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            else:
+                raise HttpError(405, "Use GET or POST /search")
+            return await self.search(fields)
+        raise HttpError(404, f"Unknown path {url.path}")
+
+    async def handle(self, reader, writer):
+        start = time.perf_counter()
+        method, target, status = "-", "-", 500
+        try:
+            try:
+                request_line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+                if not request_line:
+                    return
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+            except (asyncio.TimeoutError, ValueError):
+                return
+            self.counters["requests"] += 1
+            try:
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    raise HttpError(400, "Invalid Content-Length")
+                if length > MAX_BODY_BYTES:
+                    raise HttpError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+                try:
+                    body = await asyncio.wait_for(reader.readexactly(length), READ_TIMEOUT) if length > 0 else b""
+                except asyncio.TimeoutError:
+                    status = 408
+                    return
+                status, payload, extra = 200, await self.route(method.upper(), target, body), {}
+            except HttpError as e:
+                status, payload = e.status, {"error": str(e)}
+                extra = {"Retry-After": "1"} if e.status == 503 else {}
+            except Exception as e:
+                print(f"Error handling {method} {target}: {e}")
+                status, payload, extra = 500, {"error": f"Internal error: {e}"}, {}
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            head = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+                    "Content-Type: application/json; charset=utf-8", f"Content-Length: {len(data)}", "Connection: close"]
+            head.extend(f"{name}: {value}" for name, value in extra.items())
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            if method != "-":
+                print(f"{method} {target} {status} {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+async def serve(args):
+    memory_budget = args.cache_mb * 1024 * 1024
+    load_start = time.perf_counter()
+    # Dimuat di parent sebelum pool dibuat supaya worker hasil fork langsung hangat
+    load_worker_state(memory_budget, not args.no_index)
+    info = search_worker.worker_info()
+    print(f"Loaded {info['cv_count']} CVs ({'index' if info['index'] else 'full scan'}) "
+          f"in {time.perf_counter() - load_start:.2f}s")
+
+    def executor_factory():
+        return ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                                   initargs=(memory_budget, not args.no_index))
+
+    app = SearchServer(executor_factory, args.workers, args.max_pending or args.workers * 4, args.timeout,
+                       None if args.no_cache else ResultCache())
+    server = await asyncio.start_server(app.handle, args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} worker(s), "
+          f"max {app.max_pending} pending, timeout {args.timeout:g}s")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        print("Shutting down")
+        app.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HTTP/JSON search service sharing one warm CV corpus and index")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Search worker processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=0,
+                        help="Searches running or queued before new ones get 503 (default: 4 per worker)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds before a search request gets 504 (default: 30)")
+    parser.add_argument("--no-index", action="store_true", help="Always scan the corpus instead of using the inverted index")
+    parser.add_argument("--no-cache", action="store_true", help="Do not cache search responses")
+    parser.add_argument("--cache-mb", type=int, default=CORPUS_CACHE_BYTES // (1024 * 1024),
+                        help="Corpus text cache per process in MB")
+    args = parser.parse_args(argv)
+    args.workers = max(1, args.workers)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+PACKED_CORPUS_PATH = os.path.join("data", "index", "corpus.pack")
+
+_MAGIC = b"SCPK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHIQ")      # magic, version, reserved, doc_count, blob_offset
+_ENTRY = struct.Struct("<HQQ")          # name_length, offset, length
+
+
+def write_packed_corpus(folder_path: str = os.path.join("data", "pattern_matching"),
+                        output_path: str = PACKED_CORPUS_PATH) -> int:
+    """
+    Menggabungkan semua file .txt di folder_path menjadi satu file korpus:
+    header, tabel dokumen (nama, offset, panjang), lalu blob teks UTF-8 yang
+    bersambung. Mengembalikan jumlah dokumen yang ditulis.
+    """
+    filenames = sorted(f for f in os.listdir(folder_path) if f.endswith(".txt"))
+    encoded_names = [f.encode("utf-8") for f in filenames]
+    table_size = sum(_ENTRY.size + len(name) for name in encoded_names)
+    blob_offset = _HEADER.size + table_size
+
+    sizes = [os.path.getsize(os.path.join(folder_path, f)) for f in filenames]
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(_HEADER.pack(_MAGIC, _VERSION, 0, len(filenames), blob_offset))
+        offset = 0
+        for name, size in zip(encoded_names, sizes):
+            out.write(_ENTRY.pack(len(name), offset, size))
+            out.write(name)
+            offset += size
+        for filename, size in zip(filenames, sizes):
+            with open(os.path.join(folder_path, filename), "rb") as f:
+                data = f.read()
+            if len(data) != size:
+                raise IOError(f"{filename} changed while packing")
+            out.write(data)
+    os.replace(tmp_path, output_path)
+    print(f"Packed {len(filenames)} documents -> {output_path}")
+    return len(filenames)
+
+
+def write_packed_documents(documents: Iterable[Tuple[str, str]], output_path: str) -> int:
+    """
+    Menulis korpus packed dari iterable (filename, text) tanpa menyimpan semua
+    teks di memori: blob ditampung dulu di file sementara, lalu header dan
+    tabel dokumen ditulis sebelum blob disalin. Mengembalikan jumlah dokumen.
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    encoded_names, sizes = [], []
+    with tempfile.TemporaryFile(dir=os.path.dirname(output_path) or ".") as blob:
+        for filename, text in documents:
+            data = text.encode("utf-8")
+            blob.write(data)
+            encoded_names.append(filename.encode("utf-8"))
+            sizes.append(len(data))
+        blob_offset = _HEADER.size + sum(_ENTRY.size + len(name) for name in encoded_names)
+
+        tmp_path = output_path + ".tmp"
+        with open(tmp_path, "wb") as out:
+            out.write(_HEADER.pack(_MAGIC, _VERSION, 0, len(encoded_names), blob_offset))
+            offset = 0
+            for name, size in zip(encoded_names, sizes):
+                out.write(_ENTRY.pack(len(name), offset, size))
+                out.write(name)
+                offset += size
+            blob.seek(0)
+            shutil.copyfileobj(blob, out, 1024 * 1024)
+    os.replace(tmp_path, output_path)
+    return len(encoded_names)
+
+
+class PackedCorpus:
+    """
+    Korpus yang dibaca dari file packed lewat mmap. Berperilaku seperti list
+    (filename, text) sehingga bisa langsung dipakai search_keywords, tetapi teks
+    baru di-decode saat dokumen tersebut diakses.
+    """
+
+    def __init__(self, path: str = PACKED_CORPUS_PATH):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, doc_count, blob_offset = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"Not a packed corpus file: {path}")
+
+        self.filenames: List[str] = []
+        self._offsets: List[int] = []
+        self._lengths: List[int] = []
+        pos = _HEADER.size
+        for _ in range(doc_count):
+            name_length, offset, length = _ENTRY.unpack_from(self._mmap, pos)
+            pos += _ENTRY.size
+            self.filenames.append(self._mmap[pos:pos + name_length].decode("utf-8"))
+            pos += name_length
+            self._offsets.append(blob_offset + offset)
+            self._lengths.append(length)
+        self._positions = {name: i for i, name in enumerate(self.filenames)}
+
+    def __len__(self) -> int:
+        return len(self.filenames)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        return self.filenames[item], str(self.get_bytes(item), "utf-8")
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self._positions
+
+    def get_bytes(self, item) -> memoryview:
+        """Isi dokumen (berdasarkan indeks atau nama file) sebagai memoryview tanpa menyalin."""
+        i = self._positions[item] if isinstance(item, str) else item
+        start = self._offsets[i]
+        return memoryview(self._mmap)[start:start + self._lengths[i]]
+
+    def get_text(self, filename: str) -> Optional[str]:
+        if filename not in self._positions:
+            return None
+        return str(self.get_bytes(filename), "utf-8")
+
+    def size_of(self, filename: str) -> int:
+        return self._lengths[self._positions[filename]]
+
+    def close(self) -> None:
+        try:
+            self._mmap.close()
+        except BufferError:
+            # masih ada memoryview yang dipakai; mmap ditutup saat objek dibuang
+            pass
+        self._file.close()
+
+
+def open_packed_corpus(folder_path: str = os.path.join("data", "pattern_matching"),
+                       path: str = PACKED_CORPUS_PATH) -> Optional[PackedCorpus]:
+    """Membuka korpus packed jika ada dan tidak lebih lama dari folder sumbernya."""
+    if not os.path.exists(path):
+        return None
+    if os.path.exists(folder_path) and os.path.getmtime(folder_path) > os.path.getmtime(path):
+        print("Packed corpus is older than pattern_matching folder, ignoring")
+        return None
+    try:
+        return PackedCorpus(path)
+    except Exception as e:
+        print(f"Error opening packed corpus {path}: {e}")
+        return None
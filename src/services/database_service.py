@@ -1,71 +1,104 @@
-import mysql.connector
+import threading
+from collections import OrderedDict
+from database.db_backend import get_backend
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
 
-DB_CONFIG = { "host": "localhost", "user": "ats_user", "password": "Ats_Pass11", "database": "tubes3_seeding"}
+# Jumlah nama pelamar (per nama file CV) yang disimpan di cache
+NAME_CACHE_SIZE = 4096
+
+# Jumlah profil pelamar lengkap yang disimpan di cache
+PROFILE_CACHE_SIZE = 512
+
+class _LRUCache:
+    """
+    Cache LRU kecil yang aman dipakai antar thread. Hanya hasil yang ditemukan
+    di DB yang disimpan: CV tanpa data pelamar dicari ulang pada lookup
+    berikutnya, sehingga pelamar yang baru di-insert langsung terlihat.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if not value:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+# Nama file CV (tanpa ekstensi) -> (nama pelamar, role)
+_applicant_name_cache = _LRUCache(NAME_CACHE_SIZE)
+# Nama file CV (tanpa ekstensi) -> profil lengkap pelamar
+_applicant_profile_cache = _LRUCache(PROFILE_CACHE_SIZE)
+
+def clear_applicant_cache() -> None:
+    """
+    Mengosongkan cache nama dan profil pelamar. Dipanggil otomatis oleh
+    database/db_backend.py setiap kali data pelamar ditulis di proses ini.
+    """
+    _applicant_name_cache.clear()
+    _applicant_profile_cache.clear()
+
+def get_applicant_names_by_cvs(filenames: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+    """
+    Mengambil nama pelamar dan peran untuk banyak file CV sekaligus.
+    Nama file yang belum ada di cache di-resolve dengan satu query IN (...) per batch.
+    """
+    filenames = list(dict.fromkeys(filenames))
+    clean_names = {filename: filename.replace(".txt", "") for filename in filenames}
+    found = {}
+    for name in dict.fromkeys(clean_names.values()):
+        cached = _applicant_name_cache.get(name)
+        if cached is not None:
+            found[name] = cached
+    missing = [name for name in dict.fromkeys(clean_names.values()) if name not in found]
+
+    if missing:
+        try:
+            fetched = get_backend().get_applicant_names(missing)
+            for name, value in fetched.items():
+                _applicant_name_cache.put(name, value)
+            found.update(fetched)
+        except Exception as e:
+            print(f"DB Error in get_applicant_names_by_cvs: {e}")
+
+    return {
+        filename: found.get(clean_names[filename]) or (f"Unknown: {filename}", "N/A")
+        for filename in filenames
+    }
 
 def get_applicant_name_by_cv(filename: str) -> tuple[str, str]:
     """
     Mengambil nama pelamar dan peran dari database berdasarkan nama file CV.
     """
-    try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor(dictionary=True)
-        
-        clean_filename = filename.replace(".txt", "")
-        query = """
-        SELECT ap.first_name, ap.last_name, ad.application_role
-        FROM ApplicantProfile ap JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
-        WHERE REPLACE(SUBSTRING_INDEX(ad.cv_path, '/', -1), '.pdf', '') = %s LIMIT 1;
-        """
-        cursor.execute(query, (clean_filename,))
-        result = cursor.fetchone()
-        
-        if result:
-            return f"{result['first_name']} {result['last_name']}", result['application_role']
-        return f"Unknown: {filename}", "N/A"
-    except Exception as e:
-        print(f"DB Error in get_applicant_name_by_cv: {e}")
-        return f"Unknown: {filename}", "N/A"
-    finally:
-        if 'conn' in locals() and conn.is_connected():
-            cursor.close()
-            conn.close()
+    return get_applicant_names_by_cvs([filename])[filename]
 
 def load_applicant_by_exact_filename_from_db(file_number: str) -> dict:
     """
     Mengambil detail lengkap data pelamar dari DB berdasarkan nama file (tanpa ekstensi).
+    Hasilnya disimpan di cache LRU yang dipakai bersama halaman summary dan tombol View CV.
     """
-    applicant_data = {}
-    try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor(dictionary=True)
-        query = """
-        SELECT
-            ap.applicant_id, ap.first_name, ap.last_name, ap.date_of_birth,
-            ap.address, ap.phone_number, ad.application_role, ad.cv_path
-        FROM ApplicantProfile ap
-        JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
-        WHERE REPLACE(SUBSTRING_INDEX(ad.cv_path, '/', -1), '.pdf', '') = %s
-        LIMIT 1;
-        """
-        cursor.execute(query, (file_number,))
-        result = cursor.fetchone()
-        if result:
-            applicant_data = {
-                'applicant_id': result['applicant_id'],
-                'first_name': result['first_name'],
-                'last_name': result['last_name'],
-                'full_name': f"{result['first_name']} {result['last_name']}",
-                'date_of_birth': str(result['date_of_birth']),
-                'address': result['address'],
-                'phone_number': result['phone_number'],
-                'role': result['application_role'],
-                'cv_path': result['cv_path'],
-                'cv_filename': file_number
-            }
-    except Exception as e:
-        print(f"Database/Unexpected error in load_applicant: {e}")
-    finally:
-        if 'conn' in locals() and conn.is_connected():
-            cursor.close()
-            conn.close()
-    return applicant_data
\ No newline at end of file
+    profile = _applicant_profile_cache.get(file_number)
+    if profile is None:
+        try:
+            profile = get_backend().load_applicant(file_number)
+        except Exception as e:
+            print(f"Database/Unexpected error in load_applicant: {e}")
+            return {}
+        _applicant_profile_cache.put(file_number, profile)
+    return dict(profile)
@@ -1,12 +1,165 @@
 import os
-from typing import List, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
 
-def load_cv_text_files() -> List[Tuple[str, str]]:
+from services.corpus_store import PACKED_CORPUS_PATH, PackedCorpus, open_packed_corpus
+from services.structured_store import STRUCTURED_DB_PATH, StructuredStore
+
+# Batas memori teks CV yang disimpan di cache LazyCorpus (bisa dioverride lewat environment variable)
+CORPUS_CACHE_BYTES = int(float(os.environ.get("SCOOPY_CORPUS_CACHE_MB", 64)) * 1024 * 1024)
+
+# Jumlah CV yang bagian summary-nya disimpan di cache
+SUMMARY_CACHE_SIZE = 512
+
+
+class LazyCorpus:
+    """
+    Korpus CV yang tidak memuat semua teks ke memori. Berperilaku seperti list
+    (filename, text) untuk search_keywords: iterasi adalah generator yang
+    membaca dokumen satu per satu dari korpus packed (mmap) atau dari folder
+    pattern_matching. Teks yang sudah di-decode disimpan di cache LRU dengan
+    batas memory_budget byte.
+
+    Pemindaian penuh (iterasi) hanya mengisi cache selama masih ada sisa
+    budget dan tidak pernah mengusir dokumen lain, supaya satu scan atas
+    korpus yang lebih besar dari budget tidak menghapus isi cache.
+    Akses per dokumen lewat get_text memakai LRU biasa.
+    """
+
+    def __init__(self, folder_path: str, packed_path: Optional[str] = None,
+                 memory_budget: int = CORPUS_CACHE_BYTES, filenames: Optional[List[str]] = None):
+        self.folder_path = folder_path
+        self.packed_path = packed_path
+        self.memory_budget = memory_budget
+        self._packed: Optional[PackedCorpus] = None
+        if filenames is None:
+            if packed_path:
+                filenames = self._source().filenames
+            else:
+                filenames = sorted(f for f in os.listdir(folder_path) if f.endswith(".txt"))
+        self.filenames: List[str] = list(filenames)
+        self._names = set(self.filenames)
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _source(self) -> PackedCorpus:
+        if self._packed is None:
+            self._packed = PackedCorpus(self.packed_path)
+        return self._packed
+
+    def _read(self, filename: str) -> str:
+        if self.packed_path:
+            return self._source().get_text(filename)
+        with open(os.path.join(self.folder_path, filename), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _store(self, filename: str, text: str, evict: bool) -> None:
+        size = len(text)
+        if size > self.memory_budget:
+            return
+        if evict:
+            while self._cache and self._cached_bytes + size > self.memory_budget:
+                _, old_text = self._cache.popitem(last=False)
+                self._cached_bytes -= len(old_text)
+                self.evictions += 1
+        if self._cached_bytes + size <= self.memory_budget:
+            self._cache[filename] = text
+            self._cached_bytes += size
+
+    def _fetch(self, filename: str, evict: bool) -> str:
+        text = self._cache.get(filename)
+        if text is not None:
+            self._cache.move_to_end(filename)
+            self.hits += 1
+            return text
+        self.misses += 1
+        text = self._read(filename)
+        self._store(filename, text, evict)
+        return text
+
+    def get_text(self, filename: str) -> Optional[str]:
+        if filename not in self._names:
+            return None
+        return self._fetch(filename, evict=True)
+
+    def __len__(self) -> int:
+        return len(self.filenames)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for filename in self.filenames:
+            yield filename, self._fetch(filename, evict=False)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.subset(self.filenames[item])
+        filename = self.filenames[item]
+        return filename, self._fetch(filename, evict=True)
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self._names
+
+    def subset(self, filenames: List[str]) -> "LazyCorpus":
+        """Korpus lazy baru atas sebagian dokumen (misalnya satu shard) dengan sumber yang sama."""
+        return LazyCorpus(self.folder_path, self.packed_path, self.memory_budget, filenames)
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self.filenames), "cached_documents": len(self._cache),
+            "cached_bytes": self._cached_bytes, "memory_budget": self.memory_budget,
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+        }
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self._cached_bytes = 0
+
+    def __getstate__(self):
+        # Dikirim ke proses worker tanpa cache dan tanpa mmap yang terbuka
+        state = self.__dict__.copy()
+        state["_packed"] = None
+        state["_cache"] = OrderedDict()
+        state["_cached_bytes"] = 0
+        return state
+
+
+def _pattern_folder() -> str:
+    return "data/pattern_matching" if os.path.exists("data/pattern_matching") else "pattern_matching"
+
+def load_lazy_corpus(memory_budget: int = CORPUS_CACHE_BYTES) -> Optional[LazyCorpus]:
+    """
+    Membuka korpus CV secara lazy: memakai korpus packed jika masih segar,
+    selain itu langsung membaca file .txt dari folder pattern_matching saat dibutuhkan.
+    """
+    folder_path = _pattern_folder()
+    packed = open_packed_corpus(folder_path)
+    if packed is not None:
+        packed.close()
+        corpus = LazyCorpus(folder_path, PACKED_CORPUS_PATH, memory_budget)
+    elif os.path.exists(folder_path):
+        corpus = LazyCorpus(folder_path, memory_budget=memory_budget)
+    else:
+        print("Pattern matching folder not found")
+        return None
+    print(f"Opened {len(corpus)} pattern files lazily (cache budget {memory_budget // (1024 * 1024)} MB)")
+    return corpus
+
+def load_cv_text_files() -> Sequence[Tuple[str, str]]:
     """
     Memuat semua file .txt dari direktori pattern_matching.
+    Jika korpus packed hasil ingest tersedia, korpus dibuka lewat mmap dan
+    teks setiap CV baru di-decode saat diakses.
     """
     pattern_files = []
-    folder_path = "data/pattern_matching" if os.path.exists("data/pattern_matching") else "pattern_matching"
+    folder_path = _pattern_folder()
+    
+    packed = open_packed_corpus(folder_path)
+    if packed is not None:
+        print(f"Loaded {len(packed)} pattern files (packed corpus)")
+        return packed
     
     if not os.path.exists(folder_path):
         print("Pattern matching folder not found")
@@ -23,38 +176,114 @@ def load_cv_text_files() -> List[Tuple[str, str]]:
         print(f"Error loading data: {e}")
         return []
     
+def corpus_filenames(pattern_files: Sequence[Tuple[str, str]]) -> List[str]:
+    """
+    Daftar nama file di korpus tanpa perlu membaca teksnya jika korpus packed/lazy.
+    """
+    if hasattr(pattern_files, "filenames"):
+        return pattern_files.filenames
+    return [filename for filename, _ in pattern_files]
+
+def corpus_text_getter(pattern_files: Sequence[Tuple[str, str]]) -> Callable[[str], Optional[str]]:
+    """
+    Fungsi filename -> teks CV untuk mengambil dokumen tertentu saja.
+    """
+    if hasattr(pattern_files, "get_text"):
+        return pattern_files.get_text
+    return dict(pattern_files).get
+
+def split_cv_sections(content: str) -> dict:
+    """
+    Memecah teks CV asli menjadi bagian Experience, Education, Skills berdasarkan
+    baris judul bagian. Dipakai saat ingest dan sebagai fallback halaman summary.
+    """
+    parsed_data = {"Experience": "", "Education": "", "Skills": ""}
+    current_section = None
+    for line in content.replace("\r\n", "\n").replace("\r", "\n").split('\n'):
+        line_stripped = line.strip().lower().replace(":", "")
+
+        if any(keyword in line_stripped for keyword in ["experience", "work history", "employment"]) and len(line_stripped.split()) < 4:
+            current_section = "Experience"
+        elif any(keyword in line_stripped for keyword in ["education", "training"]) and len(line_stripped.split()) < 4:
+            current_section = "Education"
+        elif "skills" in line_stripped and len(line_stripped.split()) < 4:
+            current_section = "Skills"
+        elif current_section:
+            parsed_data[current_section] += line + "\n"
+
+    for key in parsed_data:
+        parsed_data[key] = parsed_data[key].strip()
+
+    return parsed_data
+
 def parse_cv_text_file(filename: str) -> dict:
     """
     Mem-parsing file teks CV menjadi beberapa bagian: Experience, Education, Skills.
     """
-    parsed_data = {"Experience": "", "Education": "", "Skills": ""}
     filepath = os.path.join("data", "regex_data", filename)
     
     if not os.path.exists(filepath):
         print(f"File not found for parsing: {filepath}")
-        return parsed_data
+        return split_cv_sections("")
         
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
-        
-        current_section = None
-        for line in content.split('\n'):
-            line_stripped = line.strip().lower().replace(":", "")
-
-            if any(keyword in line_stripped for keyword in ["experience", "work history", "employment"]) and len(line_stripped.split()) < 4:
-                current_section = "Experience"
-            elif any(keyword in line_stripped for keyword in ["education", "training"]) and len(line_stripped.split()) < 4:
-                current_section = "Education"
-            elif "skills" in line_stripped and len(line_stripped.split()) < 4:
-                current_section = "Skills"
-            elif current_section:
-                parsed_data[current_section] += line + "\n"
-
     except Exception as e:
         print(f"Error parsing {filename}: {e}")
-    
-    for key in parsed_data:
-        parsed_data[key] = parsed_data[key].strip()
+        return split_cv_sections("")
+
+    return split_cv_sections(content)
+
+_structured_store: Optional[StructuredStore] = None
+
+def open_structured_store() -> Optional[StructuredStore]:
+    """Store structured_info bersama untuk proses ini, None jika ingest belum pernah membuatnya."""
+    global _structured_store
+    if _structured_store is None and os.path.exists(STRUCTURED_DB_PATH):
+        _structured_store = StructuredStore(STRUCTURED_DB_PATH)
+    return _structured_store
+
+@lru_cache(maxsize=SUMMARY_CACHE_SIZE)
+def _summary_sections(filename: str) -> dict:
+    cv_name = os.path.splitext(filename)[0]
+    store = open_structured_store()
+    if store is not None:
+        try:
+            sections = store.get_summary_sections(cv_name)
+            if sections is not None:
+                return sections
+        except Exception as e:
+            print(f"Error reading structured_info of {cv_name}: {e}")
+    # CV yang belum ada di store (atau ingest lama tanpa summary_sections)
+    return parse_cv_text_file(f"{cv_name}.txt")
+
+# Versi store saat isi cache summary dibaca (None jika store belum ada)
+_summary_version = None
+
+def _structured_store_version():
+    store = open_structured_store()
+    if store is None:
+        return None
+    try:
+        return store.data_version()
+    except Exception as e:
+        print(f"Error reading structured_info version: {e}")
+        return None
+
+def load_summary_sections(filename: str) -> dict:
+    """
+    Bagian Experience/Education/Skills sebuah CV yang sudah dihitung saat ingest
+    (structured_info.db), disimpan di cache LRU sehingga membuka summary yang sama
+    lagi hanya berupa lookup dictionary. Cache dikosongkan begitu store ditulis
+    ulang oleh ingest (di proses mana pun).
+    """
+    global _summary_version
+    version = _structured_store_version()
+    if version != _summary_version:
+        _summary_sections.cache_clear()
+        _summary_version = version
+    return dict(_summary_sections(filename))
 
-    return parsed_data
\ No newline at end of file
+def clear_summary_cache() -> None:
+    _summary_sections.cache_clear()
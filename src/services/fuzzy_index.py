@@ -0,0 +1,69 @@
+import re
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from algorithms.levenshtein import bounded_levenshtein
+from services import instrumentation
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+
+def tokenize_words(text: str) -> List[str]:
+    """Tokenisasi yang sama dengan pemindaian fuzzy: kata-kata \\w+ dari teks lowercase."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """Semua string yang didapat dari word dengan menghapus paling banyak max_distance karakter."""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for candidate in frontier:
+            for i in range(len(candidate)):
+                next_frontier.add(candidate[:i] + candidate[i + 1:])
+        next_frontier -= results
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+class FuzzyIndex:
+    """
+    Index fuzzy ala SymSpell di atas vocabulary korpus. Dua string dengan jarak
+    Levenshtein <= k selalu punya hasil penghapusan (<= k karakter) yang sama,
+    sehingga kandidat cukup dicari di kamus penghapusan lalu diverifikasi,
+    tanpa memindai teks CV sama sekali.
+    """
+
+    def __init__(self, word_postings: Dict[str, Dict[str, int]]):
+        self.word_postings = word_postings
+        self._delete_maps: Dict[int, Dict[str, List[str]]] = {}
+
+    def _delete_map(self, max_distance: int) -> Dict[str, List[str]]:
+        if max_distance not in self._delete_maps:
+            delete_map: Dict[str, List[str]] = defaultdict(list)
+            for word in self.word_postings:
+                for variant in _deletes(word, max_distance):
+                    delete_map[variant].append(word)
+            self._delete_maps[max_distance] = dict(delete_map)
+        return self._delete_maps[max_distance]
+
+    def similar_words(self, keyword: str, max_distance: int = 1) -> Dict[str, int]:
+        """Kata vocabulary dengan jarak Levenshtein <= max_distance dari keyword, beserta jaraknya."""
+        delete_map = self._delete_map(max_distance)
+        candidates = set()
+        for variant in _deletes(keyword, max_distance):
+            candidates.update(delete_map.get(variant, ()))
+
+        instrumentation.count("fuzzy_words_compared", len(candidates))
+        matches = {}
+        for word in sorted(candidates):
+            distance = bounded_levenshtein(word, keyword, max_distance)
+            if distance <= max_distance:
+                matches[word] = distance
+        return matches
+
+    def lookup(self, keyword: str, max_distance: int = 1) -> Dict[str, Dict[str, int]]:
+        """Kata yang mirip keyword -> {filename: jumlah kemunculan}."""
+        return {word: self.word_postings[word] for word in self.similar_words(keyword, max_distance)}
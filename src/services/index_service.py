@@ -0,0 +1,187 @@
+import os
+import json
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from services import instrumentation
+from services.fuzzy_index import FuzzyIndex, tokenize_words
+from services.file_service import corpus_filenames
+
+INDEX_DIR = os.path.join("data", "index")
+INDEX_PATH = os.path.join(INDEX_DIR, "inverted_index.json")
+INDEX_VERSION = 2
+
+
+def _count_overlapping(text: str, pattern: str) -> int:
+    """
+    Menghitung kemunculan pattern di text termasuk yang saling tumpang tindih,
+    sama seperti hasil KMP/BM/AC.
+    """
+    count = 0
+    pos = text.find(pattern)
+    while pos != -1:
+        count += 1
+        pos = text.find(pattern, pos + 1)
+    return count
+
+
+class InvertedIndex:
+    """
+    Inverted index token -> {filename: jumlah kemunculan token} atas korpus
+    data/pattern_matching. Teks korpus sudah dinormalisasi menjadi token yang
+    dipisah satu spasi, sehingga keyword tanpa spasi selalu berada di dalam
+    satu token dan jumlah kemunculannya bisa dihitung dari posting list saja.
+    Index juga menyimpan vocabulary kata (\\w+) untuk fuzzy match.
+    """
+
+    def __init__(self, postings: Dict[str, Dict[str, int]], documents: Dict[str, int],
+                 words: Dict[str, Dict[str, int]]):
+        self.postings = postings
+        self.documents = documents
+        self.words = words
+        self._substring_cache: Dict[str, Dict[str, int]] = {}
+        self._fuzzy: Optional[FuzzyIndex] = None
+
+    @classmethod
+    def build(cls, pattern_files: Iterable[Tuple[str, str]]) -> "InvertedIndex":
+        postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        words: Dict[str, Dict[str, int]] = defaultdict(dict)
+        documents = {}
+        for filename, text in pattern_files:
+            text_lower = text.lower()
+            documents[filename] = len(text_lower)
+            for token, count in Counter(text_lower.split(" ")).items():
+                postings[token][filename] = count
+            for word, count in Counter(tokenize_words(text_lower)).items():
+                words[word][filename] = count
+        return cls(dict(postings), documents, dict(words))
+
+    @property
+    def fuzzy(self) -> FuzzyIndex:
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyIndex(self.words)
+        return self._fuzzy
+
+    def covers(self, filenames: Iterable[str]) -> bool:
+        """Index hanya dipakai jika dokumennya sama persis dengan korpus yang dicari."""
+        filenames = list(filenames)
+        return len(filenames) == len(self.documents) and all(f in self.documents for f in filenames)
+
+    def clear_cache(self) -> None:
+        self._substring_cache.clear()
+
+    def _token_counts(self, predicate, weight=None) -> Dict[str, int]:
+        counts: Dict[str, int] = defaultdict(int)
+        instrumentation.count("index_tokens_examined", len(self.postings))
+        for token, docs in self.postings.items():
+            if not predicate(token):
+                continue
+            factor = weight(token) if weight else 1
+            for filename, tf in docs.items():
+                counts[filename] += tf * factor
+        return dict(counts)
+
+    def substring_counts(self, keyword: str) -> Dict[str, int]:
+        """
+        Jumlah kemunculan keyword (tanpa spasi) per dokumen, dihitung dari
+        token-token vocabulary yang mengandung keyword tersebut.
+        """
+        if keyword not in self._substring_cache:
+            self._substring_cache[keyword] = self._token_counts(
+                lambda token: keyword in token,
+                lambda token: _count_overlapping(token, keyword),
+            )
+        return self._substring_cache[keyword]
+
+    def phrase_candidates(self, keyword: str) -> Dict[str, int]:
+        """
+        Untuk keyword yang mengandung spasi: dokumen kandidat beserta batas atas
+        jumlah kemunculannya. Bagian pertama harus menjadi akhiran token, bagian
+        tengah harus token utuh, dan bagian terakhir harus menjadi awalan token.
+        """
+        parts = keyword.split(" ")
+        per_part = [self._token_counts(lambda token, p=parts[0]: token.endswith(p))]
+        for part in parts[1:-1]:
+            per_part.append(dict(self.postings.get(part, {})))
+        per_part.append(self._token_counts(lambda token, p=parts[-1]: token.startswith(p)))
+
+        per_part.sort(key=len)
+        bounds = {}
+        for filename, count in per_part[0].items():
+            bound = count
+            for counts in per_part[1:]:
+                bound = min(bound, counts.get(filename, 0))
+                if bound == 0:
+                    break
+            if bound:
+                bounds[filename] = bound
+        return bounds
+
+    def save(self, path: str = INDEX_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "documents": self.documents,
+                       "postings": self.postings, "words": self.words},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = INDEX_PATH) -> Optional["InvertedIndex"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                print(f"Index version mismatch in {path}, ignoring")
+                return None
+            return cls(data["postings"], data["documents"], data["words"])
+        except Exception as e:
+            print(f"Error loading index {path}: {e}")
+            return None
+
+
+def count_keyword(index: InvertedIndex, keyword: str, get_text, search_fn) -> Dict[str, int]:
+    """
+    Jumlah kemunculan keyword per dokumen. Keyword tanpa spasi dijawab langsung
+    dari posting list; keyword frasa hanya memindai dokumen kandidat dengan search_fn.
+    """
+    if " " not in keyword:
+        return index.substring_counts(keyword)
+    counts = {}
+    for filename in index.phrase_candidates(keyword):
+        instrumentation.count("phrase_verifications")
+        text = get_text(filename)
+        if text is None:
+            continue
+        found = len(search_fn(text.lower(), keyword))
+        if found:
+            counts[filename] = found
+    return counts
+
+
+def build_index_from_folder(folder_path: str = os.path.join("data", "pattern_matching"),
+                            index_path: str = INDEX_PATH) -> InvertedIndex:
+    """Membangun ulang index dari seluruh file .txt hasil ekstraksi lalu menyimpannya."""
+    def iter_files():
+        for filename in sorted(os.listdir(folder_path)):
+            if filename.endswith(".txt"):
+                with open(os.path.join(folder_path, filename), "r", encoding="utf-8") as f:
+                    yield filename, f.read()
+
+    index = InvertedIndex.build(iter_files())
+    index.save(index_path)
+    print(f"Built inverted index: {len(index.documents)} documents, {len(index.postings)} tokens -> {index_path}")
+    return index
+
+
+def load_index_for(pattern_files: List[Tuple[str, str]], index_path: str = INDEX_PATH) -> Optional[InvertedIndex]:
+    """Memuat index dari disk dan memastikan index masih sesuai dengan korpus saat ini."""
+    index = InvertedIndex.load(index_path)
+    if index is None:
+        return None
+    if not index.covers(corpus_filenames(pattern_files)):
+        print("Inverted index is stale, falling back to full scan")
+        return None
+    return index
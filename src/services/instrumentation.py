@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+# File JSON lines tujuan trace (kosong = tidak ditulis)
+TRACE_FILE_ENV = "SCOOPY_TRACE_FILE"
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("scoopy_trace", default=None)
+_emit_lock = threading.Lock()
+
+
+class Trace:
+    """
+    Kumpulan span (durasi dengan resolusi perf_counter_ns) dan counter untuk
+    satu operasi, misalnya satu pencarian. Span boleh bersarang; setiap span
+    dicatat dengan offset mulai dan kedalamannya relatif terhadap awal trace.
+    """
+
+    def __init__(self, kind: str = "search", **attributes):
+        self.kind = kind
+        self.attributes: Dict[str, Any] = dict(attributes)
+        self.spans = []
+        self.counters: Dict[str, int] = defaultdict(int)
+        self._start_ns = time.perf_counter_ns()
+        self._depth = 0
+
+    @contextmanager
+    def span(self, name: str):
+        start_ns = time.perf_counter_ns()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            end_ns = time.perf_counter_ns()
+            self.spans.append({
+                "name": name, "depth": self._depth,
+                "start_us": (start_ns - self._start_ns) // 1000,
+                "duration_us": (end_ns - start_ns) // 1000,
+            })
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def merge_counters(self, counters: Dict[str, int]) -> None:
+        for name, value in counters.items():
+            self.counters[name] += value
+
+    def total_us(self, name: str) -> int:
+        return sum(span["duration_us"] for span in self.spans if span["name"] == name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind, **self.attributes,
+            "total_us": (time.perf_counter_ns() - self._start_ns) // 1000,
+            "spans": sorted(self.spans, key=lambda span: span["start_us"]),
+            "counters": dict(self.counters),
+        }
+
+    def emit(self, path: Optional[str] = None) -> None:
+        """Menambahkan trace sebagai satu baris JSON ke path atau ke $SCOOPY_TRACE_FILE jika di-set."""
+        path = path or os.environ.get(TRACE_FILE_ENV)
+        if not path:
+            return
+        record = {"timestamp": datetime.now().isoformat(timespec="milliseconds"), **self.to_dict()}
+        try:
+            with _emit_lock, open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"Error writing trace to {path}: {e}")
+
+
+@contextmanager
+def activate(trace: Trace):
+    """Menjadikan trace sebagai trace aktif di thread/context ini selama blok berjalan."""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str):
+    """Span pada trace aktif; tanpa trace aktif tidak melakukan apa-apa."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    with trace.span(name):
+        yield
+
+
+def count(name: str, value: int = 1) -> None:
+    """Menambah counter pada trace aktif (diabaikan jika tidak ada)."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.counters[name] += value
@@ -0,0 +1,112 @@
+import atexit
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from services import instrumentation
+from services.instrumentation import Trace
+from services.search_service import exact_search_by_scan, fuzzy_matches_by_scan
+
+# Di bawah jumlah CV ini pemindaian serial lebih cepat daripada overhead antar-proses
+PARALLEL_MIN_DOCS = 200
+
+# Shard korpus milik proses worker ini, diisi sekali oleh initializer
+_worker_shard: List[Tuple[str, str]] = []
+
+
+def _load_shard(shard: List[Tuple[str, str]]) -> None:
+    global _worker_shard
+    _worker_shard = shard
+
+
+def _exact_shard(keywords: List[str], algorithm: str):
+    start = time.perf_counter()
+    results, found_keywords_exact = [], set()
+    # Counter dari proses worker dikirim balik dan digabung ke trace pencarian
+    with instrumentation.activate(Trace("shard")) as trace:
+        exact_search_by_scan(keywords, algorithm, _worker_shard, results, found_keywords_exact)
+    return results, found_keywords_exact, (time.perf_counter() - start) * 1000, dict(trace.counters)
+
+
+def _fuzzy_shard(keywords_for_fuzzy: List[str], max_distance: int):
+    start = time.perf_counter()
+    with instrumentation.activate(Trace("shard")) as trace:
+        matches = list(fuzzy_matches_by_scan(keywords_for_fuzzy, _worker_shard, max_distance))
+    return matches, (time.perf_counter() - start) * 1000, dict(trace.counters)
+
+
+def _merge_shard_counters(counters) -> None:
+    trace = instrumentation.current_trace()
+    if trace is not None:
+        trace.merge_counters(counters)
+
+
+class ParallelSearcher:
+    """
+    Memindai korpus secara paralel di beberapa proses. Korpus dibagi menjadi
+    shard berurutan dan setiap shard dikirim sekali ke proses worker miliknya
+    sendiri (executor satu-worker per shard), sehingga query berikutnya cukup
+    mengirim keyword. Hasil digabung sesuai urutan shard, jadi urutannya sama
+    persis dengan pemindaian serial. Korpus kecil tetap dipindai serial.
+    """
+
+    def __init__(self, pattern_files: List[Tuple[str, str]], workers: Optional[int] = None,
+                 min_parallel_docs: int = PARALLEL_MIN_DOCS):
+        self.pattern_files = pattern_files
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(pattern_files)))
+        self.is_parallel = self.workers > 1 and len(pattern_files) >= min_parallel_docs
+        self.last_shard_times_ms: List[int] = []
+        self._executors: List[ProcessPoolExecutor] = []
+        self._shard_sizes: List[int] = []
+
+        if self.is_parallel:
+            shard_size = -(-len(pattern_files) // self.workers)
+            for start in range(0, len(pattern_files), shard_size):
+                shard = pattern_files[start:start + shard_size]
+                self._shard_sizes.append(len(shard))
+                self._executors.append(
+                    ProcessPoolExecutor(max_workers=1, initializer=_load_shard, initargs=(shard,))
+                )
+            atexit.register(self.close)
+
+    def _collect(self, futures, tracker):
+        """
+        Mengambil hasil shard sesuai urutan. Jika tracker melempar SearchCancelled,
+        shard yang belum mulai dibatalkan dan shard yang sedang jalan diabaikan.
+        """
+        try:
+            for future in futures:
+                yield tracker.wait(future) if tracker is not None else future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def exact_search(self, keywords: List[str], algorithm: str, results: list, found_keywords_exact: set,
+                     tracker=None) -> None:
+        futures = [executor.submit(_exact_shard, keywords, algorithm) for executor in self._executors]
+        self.last_shard_times_ms = []
+        for i, (shard_results, shard_found, elapsed_ms, counters) in enumerate(self._collect(futures, tracker)):
+            _merge_shard_counters(counters)
+            results.extend(shard_results)
+            found_keywords_exact.update(shard_found)
+            self.last_shard_times_ms.append(int(elapsed_ms))
+            if tracker is not None:
+                tracker.advance(self._shard_sizes[i], results)
+
+    def fuzzy_search(self, keywords_for_fuzzy: List[str], max_distance: int = 1, tracker=None, results=None):
+        futures = [executor.submit(_fuzzy_shard, keywords_for_fuzzy, max_distance) for executor in self._executors]
+        for i, (shard_matches, elapsed_ms, counters) in enumerate(self._collect(futures, tracker)):
+            _merge_shard_counters(counters)
+            if i < len(self.last_shard_times_ms):
+                self.last_shard_times_ms[i] += int(elapsed_ms)
+            yield from shard_matches
+            if tracker is not None:
+                tracker.advance(self._shard_sizes[i], results if results is not None else [])
+
+    def close(self) -> None:
+        for executor in self._executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors = []
+        self.is_parallel = False
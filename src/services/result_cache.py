@@ -0,0 +1,163 @@
+import atexit
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.corpus_store import PACKED_CORPUS_PATH
+from services.index_service import INDEX_PATH
+
+RESULT_CACHE_PATH = os.path.join("data", "index", "result_cache.json")
+RESULT_CACHE_MAX_ENTRIES = 256
+RESULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+def corpus_version(folder_path: str = os.path.join("data", "pattern_matching")) -> str:
+    """
+    Penanda versi korpus dari metadata file hasil ingest. Ingest yang mengubah
+    CV selalu menulis ulang index dan korpus packed, dan menambah/menghapus CV
+    mengubah mtime folder, sehingga penanda ini berubah setiap korpus berubah.
+    """
+    parts = []
+    for path in (folder_path, INDEX_PATH, PACKED_CORPUS_PATH):
+        try:
+            stat = os.stat(path)
+            parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            parts.append("-")
+    return "|".join(parts)
+
+
+def make_key(keywords: List[str], max_distance: int, cv_count: int) -> str:
+    """
+    Kunci cache dari keyword yang sudah dinormalisasi (urutan dipertahankan
+    karena menentukan urutan keyword_details), opsi fuzzy, dan ukuran korpus.
+    Algoritma tidak ikut karena KMP/BM/AC menghasilkan jumlah yang sama.
+    """
+    return json.dumps([keywords, max_distance, cv_count], ensure_ascii=False, separators=(",", ":"))
+
+
+class ResultCache:
+    """
+    Cache LRU hasil search_keywords yang dibatasi jumlah entri dan total byte.
+    Setiap entri disimpan sebagai JSON, sehingga ukurannya pasti dan hit selalu
+    mengembalikan salinan baru. Seluruh isi cache dibuang begitu versi korpus
+    berubah. Jika path diberikan, cache dimuat dari dan disimpan ke disk.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES, max_bytes: int = RESULT_CACHE_MAX_BYTES,
+                 path: Optional[str] = None, version_fn=corpus_version):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self.version_fn = version_fn
+        self.version = version_fn()
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        if path:
+            self._load()
+            atexit.register(self.save)
+
+    def _check_version(self) -> None:
+        version = self.version_fn()
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self.version = version
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._check_version()
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return json.loads(payload)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._check_version()
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.encode("utf-8"))
+            while self._entries and (len(self._entries) >= self.max_entries or self._bytes + size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.encode("utf-8"))
+                self.evictions += 1
+            self._entries[key] = payload
+            self._bytes += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions, "invalidations": self.invalidations}
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading result cache {self.path}: {e}")
+            return
+        if data.get("version") != self.version:
+            return
+        # Entri terbaru (akhir daftar) diprioritaskan jika batas cache mengecil
+        kept: List[Tuple[str, str]] = []
+        for key, payload in reversed(data.get("entries", [])):
+            size = len(payload.encode("utf-8"))
+            if len(kept) >= self.max_entries or self._bytes + size > self.max_bytes:
+                break
+            kept.append((key, payload))
+            self._bytes += size
+        self._entries.update(reversed(kept))
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = {"version": self.version, "entries": list(self._entries.items())}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving result cache {self.path}: {e}")
+
+
+_shared_caches: Dict[str, ResultCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def shared_result_cache(path: str = RESULT_CACHE_PATH) -> ResultCache:
+    """
+    Satu ResultCache per file cache untuk seluruh proses. Setiap instance
+    menyimpan isinya ke path saat exit, sehingga beberapa instance untuk file
+    yang sama (misalnya satu per sesi GUI) akan saling menimpa.
+    """
+    with _shared_caches_lock:
+        if path not in _shared_caches:
+            _shared_caches[path] = ResultCache(path=path)
+        return _shared_caches[path]
@@ -0,0 +1,58 @@
+import json
+import os
+from typing import Any, Dict, Optional
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+# URL server pencarian (src/server.py); jika di-set, GUI memakai server ini
+SEARCH_URL_ENV = "SCOOPY_SEARCH_URL"
+
+
+class SearchServiceError(Exception):
+    """Server pencarian menolak request, gagal, atau tidak bisa dihubungi."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class SearchClient:
+    """
+    Client tipis untuk src/server.py. search() menerima argumen yang sama
+    dengan search_keywords dan mengembalikan search_data dengan bentuk yang
+    sama (results, exact_time_ms, fuzzy_time_ms, cv_count, trace, ...).
+    """
+
+    def __init__(self, base_url: str, timeout: float = 60.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = Request(self.base_url + path, data=data, headers={"Content-Type": "application/json"})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise SearchServiceError(f"{e.code}: {message}", e.code) from None
+        except (URLError, OSError) as e:
+            raise SearchServiceError(f"Search service unreachable at {self.base_url}: {e}") from None
+
+    def health(self) -> Dict[str, Any]:
+        return self._request("/health")
+
+    def search(self, keywords_input: str, algorithm: str, max_results_count: int, max_distance: int = 1,
+               attach_names: bool = True, trace: bool = True) -> Dict[str, Any]:
+        return self._request("/search", {
+            "keywords": keywords_input, "algorithm": algorithm, "max_results": max_results_count,
+            "max_distance": max_distance, "skip_names": not attach_names, "trace": trace,
+        })
+
+
+def client_from_env() -> Optional[SearchClient]:
+    url = os.environ.get(SEARCH_URL_ENV)
+    return SearchClient(url) if url else None
@@ -1,67 +1,152 @@
+import heapq
 import re
 import time
-from collections import Counter
-from typing import List, Tuple, Dict, Any
+from collections import Counter, defaultdict
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import List, Tuple, Dict, Any, Optional
 
-from algorithms.boyer_moore import boyer_moore_search
+from algorithms.boyer_moore import BOYER_MOORE_VARIANTS
 from algorithms.kmp import kmp_search
-from algorithms.ahocorasick import aho_corasick_search
-from services.database_service import get_applicant_name_by_cv
-
-def _levenshtein_distance(s1: str, s2: str) -> int:
-    if len(s1) < len(s2):
-        return _levenshtein_distance(s2, s1)
-    if len(s2) == 0:
-        return len(s1)
-    previous_row = list(range(len(s2) + 1))
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-    return previous_row[-1]
+from algorithms.ahocorasick import AhoCorasick, aho_corasick_search
+from algorithms.levenshtein import levenshtein_batch
+from services.database_service import get_applicant_names_by_cvs
+from services.file_service import corpus_filenames, corpus_text_getter
+from services.index_service import InvertedIndex, count_keyword
+from services import instrumentation
+from services.instrumentation import Trace
+from services.result_cache import make_key
+
+# Varian Boyer-Moore untuk tombol "BM"; Horspool tercepat pada korpus CV
+BM_VARIANT = "horspool"
+
+# Progress pemindaian dilaporkan setiap sekian CV
+PROGRESS_EVERY = 25
+
+
+class SearchCancelled(Exception):
+    """Pencarian dihentikan karena cancel_event di-set."""
+
+
+class SearchProgress:
+    """
+    Melacak jumlah CV yang sudah dipindai per fase ("exact"/"fuzzy"),
+    memanggil callback(phase, scanned, total, partial_results) secara berkala,
+    dan melempar SearchCancelled begitu cancel_event di-set.
+    """
+
+    def __init__(self, total: int, callback=None, cancel_event=None):
+        self.total = total
+        self.callback = callback
+        self.cancel_event = cancel_event
+        self.phase = None
+        self.scanned = 0
+
+    def check(self) -> None:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SearchCancelled()
+
+    def start(self, phase: str) -> None:
+        self.check()
+        self.phase = phase
+        self.scanned = 0
+
+    def advance(self, count: int, results: list) -> None:
+        self.scanned += count
+        self.check()
+        if self.callback is not None:
+            self.callback(self.phase, self.scanned, self.total, list(results))
+
+    def track(self, pattern_files, results: list):
+        """Membungkus iterasi korpus; progress dilaporkan setelah CV selesai diproses."""
+        pending = 0
+        for item in pattern_files:
+            self.check()
+            yield item
+            pending += 1
+            if pending == PROGRESS_EVERY:
+                self.advance(pending, results)
+                pending = 0
+        if pending:
+            self.advance(pending, results)
+
+    def wait(self, future):
+        """Menunggu hasil future sambil tetap memeriksa pembatalan."""
+        if self.cancel_event is None:
+            return future.result()
+        while True:
+            try:
+                return future.result(timeout=0.05)
+            except FutureTimeoutError:
+                self.check()
 
 def _fuzzy_search(text: str, keyword: str, max_distance: int = 1) -> Dict[str, int]:
-    words = re.findall(r'\b\w+\b', text.lower())
-    keyword_lower = keyword.lower()
-    found_words_counter = Counter()
-    for word in words:
-        if _levenshtein_distance(word, keyword_lower) <= max_distance:
-            found_words_counter[word] += 1
-    return dict(found_words_counter)
+    word_counts = Counter(re.findall(r'\b\w+\b', text.lower()))
+    unique_words = list(word_counts)
+    instrumentation.count("fuzzy_words_compared", len(unique_words))
+    distances = levenshtein_batch(keyword.lower(), unique_words, max_distance)
+    return {word: word_counts[word] for word, distance in zip(unique_words, distances) if distance <= max_distance}
 
 def _search_with_algorithm(text: str, keyword: str, algorithm: str = 'kmp') -> list:
     if algorithm == 'kmp':
         return kmp_search(text, keyword)
     elif algorithm in ['boyer-moore', 'bm']:
-        return boyer_moore_search(text, keyword)
+        return BOYER_MOORE_VARIANTS[BM_VARIANT](text, keyword)
+    elif algorithm in BOYER_MOORE_VARIANTS:
+        return BOYER_MOORE_VARIANTS[algorithm](text, keyword)
     elif algorithm in ['ahocorasick', 'ac']:
         matches = aho_corasick_search(text, [keyword])
         return [start for pattern, start, end in matches if pattern == keyword]
     return []
 
-def search_keywords(
-    keywords_input: str,
+def _exact_search_with_index(
+    index: InvertedIndex,
+    keywords: List[str],
     algorithm: str,
-    max_results_count: int,
-    pattern_files: List[Tuple[str, str]]
-) -> Dict[str, Any]:
-    if not pattern_files:
-        return {"results": [], "exact_time_ms": 0, "fuzzy_time_ms": 0, "cv_count": 0}
+    pattern_files: List[Tuple[str, str]],
+    results: list,
+    found_keywords_exact: set
+) -> None:
+    """
+    Exact match lewat inverted index: hanya posting list keyword yang disentuh.
+    Jumlah kemunculan per CV sama dengan hasil pemindaian KMP/BM/AC.
+    """
+    get_text = corpus_text_getter(pattern_files) if any(" " in kw for kw in keywords) else None
+    search_fn = lambda text, keyword: _search_with_algorithm(text, keyword, algorithm)
+    counts_per_keyword = [(keyword, count_keyword(index, keyword, get_text, search_fn)) for keyword in keywords]
 
-    keywords = [kw.strip().lower() for kw in keywords_input.split(',') if kw.strip()]
-    if not keywords:
-        return {"results": [], "exact_time_ms": 0, "fuzzy_time_ms": 0, "cv_count": len(pattern_files)}
+    for filename in corpus_filenames(pattern_files):
+        keyword_results = {}
+        total_matches = 0
+        for keyword, counts in counts_per_keyword:
+            count = counts.get(filename, 0)
+            if count:
+                found_keywords_exact.add(keyword)
+                if keyword not in keyword_results:
+                    keyword_results[keyword] = {'count': 0, 'type': 'exact'}
+                keyword_results[keyword]['count'] += count
+                total_matches += count
+        if keyword_results:
+            results.append({"name": None, "role": None, "filename": filename, "total_matches": total_matches, "keyword_details": keyword_results, "match_type": "exact"})
 
-    results = []
-    found_keywords_exact = set()
+def exact_search_by_scan(
+    keywords: List[str],
+    algorithm: str,
+    pattern_files: List[Tuple[str, str]],
+    results: list,
+    found_keywords_exact: set
+) -> None:
+    """
+    Exact match dengan memindai setiap CV memakai algoritma yang dipilih.
+    """
+    if algorithm in ['ahocorasick', 'ac']:
+        _exact_search_multi_pattern(keywords, pattern_files, results, found_keywords_exact)
+        return
 
-    exact_start_time = time.time()
     for filename, text in pattern_files:
         text_lower = text.lower()
+        instrumentation.count("documents_scanned")
+        instrumentation.count("bytes_scanned", len(text_lower))
+        instrumentation.count("pattern_searches", len(keywords))
         keyword_results = {}
         total_matches = 0
         for keyword in keywords:
@@ -73,45 +158,381 @@ def search_keywords(
                 keyword_results[keyword]['count'] += len(positions)
                 total_matches += len(positions)
         if keyword_results:
-            name, role = get_applicant_name_by_cv(filename)
-            results.append({"name": name, "role": role, "filename": filename, "total_matches": total_matches, "keyword_details": keyword_results, "match_type": "exact"})
-    exact_time_ms = int((time.time() - exact_start_time) * 1000)
+            results.append({"name": None, "role": None, "filename": filename, "total_matches": total_matches, "keyword_details": keyword_results, "match_type": "exact"})
 
-    keywords_for_fuzzy = [kw for kw in keywords if kw not in found_keywords_exact]
-    fuzzy_time_ms = 0
+def _exact_search_multi_pattern(
+    keywords: List[str],
+    pattern_files: List[Tuple[str, str]],
+    results: list,
+    found_keywords_exact: set
+) -> None:
+    """
+    Exact match Aho-Corasick: satu automaton untuk semua keyword dibangun sekali
+    per query, lalu setiap CV cukup dipindai satu kali.
+    """
+    with instrumentation.span("build"):
+        automaton = AhoCorasick()
+        automaton.add_patterns(list(dict.fromkeys(keywords)))
+    instrumentation.count("automaton_states", automaton.state_count)
+
+    for filename, text in pattern_files:
+        text_lower = text.lower()
+        instrumentation.count("documents_scanned")
+        instrumentation.count("bytes_scanned", len(text_lower))
+        counts = automaton.count_matches(text_lower)
+        keyword_results = {}
+        total_matches = 0
+        for keyword in keywords:
+            count = counts.get(keyword, 0)
+            if count:
+                found_keywords_exact.add(keyword)
+                if keyword not in keyword_results:
+                    keyword_results[keyword] = {'count': 0, 'type': 'exact'}
+                keyword_results[keyword]['count'] += count
+                total_matches += count
+        if keyword_results:
+            results.append({"name": None, "role": None, "filename": filename, "total_matches": total_matches, "keyword_details": keyword_results, "match_type": "exact"})
+
+def _add_fuzzy_matches(all_fuzzy_matches_for_cv: dict, keyword: str, found_matches: Dict[str, int]) -> int:
+    added = 0
+    for found_word, count in found_matches.items():
+        if found_word == keyword: continue
+        if found_word not in all_fuzzy_matches_for_cv:
+            all_fuzzy_matches_for_cv[found_word] = {'count': 0, 'type': 'fuzzy'}
+        all_fuzzy_matches_for_cv[found_word]['count'] += count
+        added += count
+    return added
+
+def fuzzy_matches_by_scan(keywords_for_fuzzy: List[str], pattern_files: List[Tuple[str, str]], max_distance: int = 1):
+    """
+    Fuzzy match dengan memindai setiap kata di setiap CV.
+    Menghasilkan (filename, detail kata fuzzy, total kemunculan) untuk CV yang cocok.
+    """
+    for filename, text in pattern_files:
+        text_lower = text.lower()
+        instrumentation.count("fuzzy_documents_scanned")
+        instrumentation.count("fuzzy_bytes_scanned", len(text_lower))
+        all_fuzzy_matches_for_cv = {}
+        total_fuzzy_matches_for_cv = 0
+        for keyword in keywords_for_fuzzy:
+            found_matches = _fuzzy_search(text_lower, keyword, max_distance)
+            total_fuzzy_matches_for_cv += _add_fuzzy_matches(all_fuzzy_matches_for_cv, keyword, found_matches)
+        if all_fuzzy_matches_for_cv:
+            yield filename, all_fuzzy_matches_for_cv, total_fuzzy_matches_for_cv
+
+def _fuzzy_matches_with_index(index: InvertedIndex, keywords_for_fuzzy: List[str], pattern_files: List[Tuple[str, str]], max_distance: int = 1):
+    """
+    Fuzzy match lewat index vocabulary: kandidat kata dicari sekali per keyword,
+    lalu dipetakan kembali ke CV lewat posting list kata tersebut.
+    """
+    lookups = [(keyword, index.fuzzy.lookup(keyword, max_distance)) for keyword in keywords_for_fuzzy]
+    for filename in corpus_filenames(pattern_files):
+        all_fuzzy_matches_for_cv = {}
+        total_fuzzy_matches_for_cv = 0
+        for keyword, similar in lookups:
+            found_matches = {word: docs[filename] for word, docs in similar.items() if filename in docs}
+            total_fuzzy_matches_for_cv += _add_fuzzy_matches(all_fuzzy_matches_for_cv, keyword, found_matches)
+        if all_fuzzy_matches_for_cv:
+            yield filename, all_fuzzy_matches_for_cv, total_fuzzy_matches_for_cv
 
+def _merge_fuzzy_matches(result: dict, all_fuzzy_matches_for_cv: dict, total_fuzzy_matches_for_cv: int) -> None:
+    for word, details in all_fuzzy_matches_for_cv.items():
+        if word in result['keyword_details']:
+            result['keyword_details'][word]['count'] += details['count']
+        else:
+            result['keyword_details'][word] = details
+    result['total_matches'] += total_fuzzy_matches_for_cv
+    result['match_type'] = 'mixed'
+
+def _select_top_k(results: list, k: int) -> list:
+    """
+    Sama dengan sort stabil menurun berdasarkan total_matches lalu dipotong k,
+    tetapi dengan heap O(n log k) jika hanya sebagian kecil hasil yang diminta.
+    """
+    if k <= 0 or k >= len(results):
+        return sorted(results, key=lambda x: x["total_matches"], reverse=True)
+    return heapq.nlargest(k, results, key=lambda x: x["total_matches"])
+
+def _top_k_with_index(
+    index: InvertedIndex,
+    keywords: List[str],
+    algorithm: str,
+    pattern_files: List[Tuple[str, str]],
+    k: int,
+    max_distance: int,
+    tracker: SearchProgress
+) -> Tuple[list, int, int]:
+    """
+    Top-k lewat index tanpa membangun hasil untuk setiap CV. Jumlah keyword
+    tanpa spasi dan jumlah fuzzy diketahui pasti dari posting list, sedangkan
+    keyword frasa hanya punya batas atas. CV diperiksa mulai dari batas atas
+    terbesar dan berhenti begitu batas atas CV berikutnya lebih kecil dari
+    skor ke-k, sehingga teks CV lain tidak perlu dibaca sama sekali.
+    Urutan hasil sama persis dengan sort stabil pada jalur biasa.
+    """
+    exact_start_time = time.perf_counter()
+    search_fn = lambda text, keyword: _search_with_algorithm(text, keyword, algorithm)
+    get_text = corpus_text_getter(pattern_files)
+    unique_keywords = list(dict.fromkeys(keywords))
+    verified: Dict[Tuple[str, str], int] = {}
+
+    def phrase_count(keyword: str, filename: str) -> int:
+        if (keyword, filename) not in verified:
+            tracker.check()
+            instrumentation.count("phrase_verifications")
+            text = get_text(filename)
+            verified[(keyword, filename)] = len(search_fn(text.lower(), keyword)) if text is not None else 0
+        return verified[(keyword, filename)]
+
+    with instrumentation.span("exact"):
+        exact_counts = {kw: index.substring_counts(kw) for kw in unique_keywords if " " not in kw}
+        phrase_bounds = {kw: index.phrase_candidates(kw) for kw in unique_keywords if " " in kw}
+
+        # Keyword frasa dianggap ditemukan begitu satu kandidat terbukti cocok
+        found_keywords_exact = {kw for kw, counts in exact_counts.items() if counts}
+        for keyword, bounds in phrase_bounds.items():
+            if any(phrase_count(keyword, filename) for filename in sorted(bounds, key=bounds.get, reverse=True)):
+                found_keywords_exact.add(keyword)
+    tracker.advance(len(pattern_files), [])
+    exact_time_ms = int((time.perf_counter() - exact_start_time) * 1000)
+
+    fuzzy_start_time = time.perf_counter()
+    keywords_for_fuzzy = [kw for kw in keywords if kw not in found_keywords_exact]
+    lookups = []
+    fuzzy_totals: Dict[str, int] = defaultdict(int)
     if keywords_for_fuzzy:
-        fuzzy_start_time = time.time()
-        for filename, text in pattern_files:
-            text_lower = text.lower()
+        tracker.start("fuzzy")
+        with instrumentation.span("fuzzy"):
+            lookups = [(keyword, index.fuzzy.lookup(keyword, max_distance)) for keyword in keywords_for_fuzzy]
+            for keyword, similar in lookups:
+                for word, docs in similar.items():
+                    if word == keyword: continue
+                    for filename, count in docs.items():
+                        fuzzy_totals[filename] += count
+        tracker.advance(len(pattern_files), [])
+    fuzzy_time_ms = int((time.perf_counter() - fuzzy_start_time) * 1000)
+
+    ranking_start_time = time.perf_counter()
+    with instrumentation.span("rank"):
+        filenames = corpus_filenames(pattern_files)
+        candidates = []
+        for position, filename in enumerate(filenames):
+            bound = fuzzy_totals.get(filename, 0)
+            for keyword in keywords:
+                if keyword in exact_counts:
+                    bound += exact_counts[keyword].get(filename, 0)
+                else:
+                    bound += phrase_bounds[keyword].get(filename, 0)
+            if bound:
+                candidates.append((bound, position, filename))
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        instrumentation.count("topk_candidates", len(candidates))
+
+        # Min-heap berisi k hasil terbaik: (skor, -urutan pada jalur biasa, hasil)
+        best = []
+        for bound, position, filename in candidates:
+            if len(best) == k and bound < best[0][0]:
+                break
+            instrumentation.count("topk_evaluated")
+            keyword_results = {}
+            total_matches = 0
+            for keyword in keywords:
+                if keyword in exact_counts:
+                    count = exact_counts[keyword].get(filename, 0)
+                else:
+                    count = phrase_count(keyword, filename) if filename in phrase_bounds[keyword] else 0
+                if count:
+                    if keyword not in keyword_results:
+                        keyword_results[keyword] = {'count': 0, 'type': 'exact'}
+                    keyword_results[keyword]['count'] += count
+                    total_matches += count
+
             all_fuzzy_matches_for_cv = {}
             total_fuzzy_matches_for_cv = 0
-            for keyword in keywords_for_fuzzy:
-                found_matches = _fuzzy_search(text_lower, keyword)
-                if found_matches:
-                    for found_word, count in found_matches.items():
-                        if found_word == keyword: continue
-                        if found_word not in all_fuzzy_matches_for_cv:
-                            all_fuzzy_matches_for_cv[found_word] = {'count': 0, 'type': 'fuzzy'}
-                        all_fuzzy_matches_for_cv[found_word]['count'] += count
-                        total_fuzzy_matches_for_cv += count
-            if all_fuzzy_matches_for_cv:
-                existing_result = next((r for r in results if r['filename'] == filename), None)
+            if filename in fuzzy_totals:
+                for keyword, similar in lookups:
+                    found_matches = {word: docs[filename] for word, docs in similar.items() if filename in docs}
+                    total_fuzzy_matches_for_cv += _add_fuzzy_matches(all_fuzzy_matches_for_cv, keyword, found_matches)
+
+            if keyword_results:
+                result = {"name": None, "role": None, "filename": filename, "total_matches": total_matches, "keyword_details": keyword_results, "match_type": "exact"}
+                if all_fuzzy_matches_for_cv:
+                    _merge_fuzzy_matches(result, all_fuzzy_matches_for_cv, total_fuzzy_matches_for_cv)
+                order = position
+            elif all_fuzzy_matches_for_cv:
+                result = {"name": None, "role": None, "filename": filename, "total_matches": total_fuzzy_matches_for_cv, "keyword_details": all_fuzzy_matches_for_cv, "match_type": "fuzzy"}
+                # Pada jalur biasa hasil fuzzy-saja ditambahkan setelah semua hasil exact
+                order = len(filenames) + position
+            else:
+                continue
+
+            entry = (result["total_matches"], -order, result)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry[:2] > best[0][:2]:
+                heapq.heapreplace(best, entry)
+    exact_time_ms += int((time.perf_counter() - ranking_start_time) * 1000)
+
+    return [result for _, _, result in sorted(best, key=lambda e: e[:2], reverse=True)], exact_time_ms, fuzzy_time_ms
+
+def _collect_all_matches(
+    keywords: List[str],
+    algorithm: str,
+    pattern_files: List[Tuple[str, str]],
+    index: Optional[InvertedIndex],
+    max_distance: int,
+    searcher,
+    tracker: SearchProgress
+) -> Tuple[list, int, int]:
+    """
+    Hasil (belum terurut) untuk semua CV yang cocok: exact match lalu fuzzy
+    match untuk keyword yang tidak ditemukan sama sekali.
+    """
+    results = []
+    found_keywords_exact = set()
+
+    exact_start_time = time.perf_counter()
+    with instrumentation.span("exact"):
+        if index is not None:
+            _exact_search_with_index(index, keywords, algorithm, pattern_files, results, found_keywords_exact)
+            tracker.advance(len(pattern_files), results)
+        elif searcher is not None:
+            searcher.exact_search(keywords, algorithm, results, found_keywords_exact, tracker)
+        else:
+            exact_search_by_scan(keywords, algorithm, tracker.track(pattern_files, results), results, found_keywords_exact)
+    exact_time_ms = int((time.perf_counter() - exact_start_time) * 1000)
+
+    keywords_for_fuzzy = [kw for kw in keywords if kw not in found_keywords_exact]
+    fuzzy_time_ms = 0
+
+    if keywords_for_fuzzy:
+        fuzzy_start_time = time.perf_counter()
+        with instrumentation.span("fuzzy"):
+            tracker.start("fuzzy")
+            results_by_filename = {r['filename']: r for r in results}
+            if index is not None:
+                fuzzy_matches_per_cv = _fuzzy_matches_with_index(index, keywords_for_fuzzy, pattern_files, max_distance)
+            elif searcher is not None:
+                fuzzy_matches_per_cv = searcher.fuzzy_search(keywords_for_fuzzy, max_distance, tracker, results)
+            else:
+                fuzzy_matches_per_cv = fuzzy_matches_by_scan(keywords_for_fuzzy, tracker.track(pattern_files, results), max_distance)
+            for filename, all_fuzzy_matches_for_cv, total_fuzzy_matches_for_cv in fuzzy_matches_per_cv:
+                existing_result = results_by_filename.get(filename)
                 if existing_result:
-                    for word, details in all_fuzzy_matches_for_cv.items():
-                        if word in existing_result['keyword_details']:
-                            existing_result['keyword_details'][word]['count'] += details['count']
-                        else:
-                            existing_result['keyword_details'][word] = details
-                    existing_result['total_matches'] += total_fuzzy_matches_for_cv
-                    existing_result['match_type'] = 'mixed'
+                    _merge_fuzzy_matches(existing_result, all_fuzzy_matches_for_cv, total_fuzzy_matches_for_cv)
                 else:
-                    name, role = get_applicant_name_by_cv(filename)
-                    results.append({"name": name, "role": role, "filename": filename, "total_matches": total_fuzzy_matches_for_cv, "keyword_details": all_fuzzy_matches_for_cv, "match_type": "fuzzy"})
-        fuzzy_time_ms = int((time.time() - fuzzy_start_time) * 1000)
+                    results.append({"name": None, "role": None, "filename": filename, "total_matches": total_fuzzy_matches_for_cv, "keyword_details": all_fuzzy_matches_for_cv, "match_type": "fuzzy"})
+            if index is not None:
+                tracker.advance(len(pattern_files), results)
+        fuzzy_time_ms = int((time.perf_counter() - fuzzy_start_time) * 1000)
+
+    return results, exact_time_ms, fuzzy_time_ms
+
+def _attach_applicant_names(results: list) -> None:
+    """
+    Mengisi nama dan role pelamar untuk semua hasil dengan satu lookup batch.
+    """
+    with instrumentation.span("db"):
+        names = get_applicant_names_by_cvs([r['filename'] for r in results])
+    instrumentation.count("db_lookups", len(results))
+    for result in results:
+        result['name'], result['role'] = names[result['filename']]
+
+def search_keywords(
+    keywords_input: str,
+    algorithm: str,
+    max_results_count: int,
+    pattern_files: List[Tuple[str, str]],
+    index: Optional[InvertedIndex] = None,
+    max_distance: int = 1,
+    searcher=None,
+    progress=None,
+    cancel_event=None,
+    cache=None,
+    attach_names: bool = True,
+    trace: Optional[Trace] = None
+) -> Dict[str, Any]:
+    """
+    progress(phase, scanned, total, partial_results) dipanggil berkala selama
+    pemindaian dengan hasil sementara (belum terurut, nama belum terisi).
+    Jika cancel_event di-set, pencarian berhenti dengan SearchCancelled.
+    Jika cache (ResultCache) diberikan, query yang sama untuk versi korpus yang
+    sama dijawab dari cache dan search_data["cache_hit"] bernilai True.
+    attach_names=False melewati lookup nama pelamar ke database (name/role None).
+
+    Span per fase dan counter dikembalikan di search_data["trace"]. Jika trace
+    tidak diberikan, trace baru dibuat dan langsung ditulis ke $SCOOPY_TRACE_FILE;
+    jika diberikan, pemanggil boleh menambah span (misalnya render) lalu emit sendiri.
+    """
+    owns_trace = trace is None
+    if owns_trace:
+        trace = Trace("search", query=keywords_input, algorithm=algorithm, max_results=max_results_count)
+    with instrumentation.activate(trace), trace.span("search"):
+        search_data = _run_search(keywords_input, algorithm, max_results_count, pattern_files, index,
+                                  max_distance, searcher, progress, cancel_event, cache, attach_names)
+    trace.count("results", len(search_data["results"]))
+    search_data["trace"] = trace.to_dict()
+    if owns_trace:
+        trace.emit()
+    return search_data
+
+def _run_search(keywords_input, algorithm, max_results_count, pattern_files, index,
+                max_distance, searcher, progress, cancel_event, cache, attach_names) -> Dict[str, Any]:
+    if not pattern_files:
+        return {"results": [], "exact_time_ms": 0, "fuzzy_time_ms": 0, "cv_count": 0}
+
+    keywords = [kw.strip().lower() for kw in keywords_input.split(',') if kw.strip()]
+    if not keywords:
+        return {"results": [], "exact_time_ms": 0, "fuzzy_time_ms": 0, "cv_count": len(pattern_files)}
+
+    cache_key = make_key(keywords, max_distance, len(pattern_files)) if cache is not None else None
+    if cache is not None:
+        lookup_start_time = time.perf_counter()
+        with instrumentation.span("cache"):
+            cached = cache.get(cache_key)
+        # Entri cache berisi top-k dengan k tertentu (0 = semua hasil); hanya bisa
+        # dipakai jika k yang diminta tidak lebih besar atau hasilnya memang lebih sedikit
+        if cached is not None and (cached.get("k", 0) <= 0 or len(cached["results"]) < cached["k"]
+                                   or 0 < max_results_count <= cached["k"]):
+            results = cached["results"][:max_results_count] if max_results_count > 0 else cached["results"]
+            # Cache hanya menyimpan hasil pencarian; nama pelamar selalu diambil dari DB saat ini
+            for result in results:
+                result['name'], result['role'] = None, None
+            if attach_names:
+                _attach_applicant_names(results)
+            return {"results": results, "exact_time_ms": cached["exact_time_ms"], "fuzzy_time_ms": cached["fuzzy_time_ms"],
+                    "cv_count": len(pattern_files), "cache_hit": True,
+                    "cache_time_ms": int((time.perf_counter() - lookup_start_time) * 1000)}
+
+    use_searcher = index is None and searcher is not None and searcher.is_parallel
+    tracker = SearchProgress(len(pattern_files), progress, cancel_event)
+    tracker.start("exact")
+
+    if index is not None and max_results_count > 0:
+        results, exact_time_ms, fuzzy_time_ms = _top_k_with_index(
+            index, keywords, algorithm, pattern_files, max_results_count, max_distance, tracker
+        )
+    else:
+        results, exact_time_ms, fuzzy_time_ms = _collect_all_matches(
+            keywords, algorithm, pattern_files, index, max_distance, searcher if use_searcher else None, tracker
+        )
+        instrumentation.count("matches", len(results))
+        with instrumentation.span("sort"):
+            results = _select_top_k(results, max_results_count)
 
-    results.sort(key=lambda x: x["total_matches"], reverse=True)
-    if max_results_count > 0:
-        results = results[:max_results_count]
+    # Nama pelamar hanya dicari untuk k hasil akhir
+    tracker.check()
+    if cache is not None:
+        # Disimpan sebelum nama diisi supaya nama lama tidak ikut tersimpan (dan dipersist ke disk)
+        cache.put(cache_key, {"results": results, "k": max_results_count, "exact_time_ms": exact_time_ms, "fuzzy_time_ms": fuzzy_time_ms})
+    if attach_names:
+        _attach_applicant_names(results)
 
-    return {"results": results, "exact_time_ms": exact_time_ms, "fuzzy_time_ms": fuzzy_time_ms, "cv_count": len(pattern_files)}
\ No newline at end of file
+    search_data = {"results": results, "exact_time_ms": exact_time_ms, "fuzzy_time_ms": fuzzy_time_ms, "cv_count": len(pattern_files)}
+    if cache is not None:
+        search_data["cache_hit"] = False
+    if use_searcher:
+        search_data["shard_times_ms"] = searcher.last_shard_times_ms
+    if hasattr(pattern_files, "stats"):
+        search_data["corpus_cache"] = pattern_files.stats()
+    return search_data
@@ -0,0 +1,89 @@
+import sys
+import time
+from typing import Any, Dict
+
+from services.file_service import CORPUS_CACHE_BYTES, load_lazy_corpus
+from services.index_service import InvertedIndex, load_index_for
+from services.result_cache import corpus_version
+from services.search_service import search_keywords
+
+# Korpus dan index milik proses ini, dimuat sekali lalu dipakai semua query
+_corpus = None
+_index = None
+# Versi korpus (corpus_version) saat state dimuat dan opsi pemuatannya
+_version = None
+_options = (CORPUS_CACHE_BYTES, True)
+
+
+def _load(memory_budget: int, use_index: bool) -> None:
+    global _corpus, _index, _version, _options
+    # Versi dibaca sebelum memuat: ingest yang selesai di tengah pemuatan terdeteksi pada query berikutnya
+    version = corpus_version()
+    corpus = load_lazy_corpus(memory_budget) or []
+    index = None
+    if use_index and corpus:
+        index = load_index_for(corpus)
+        if index is None:
+            print("Building inverted index in memory (run extract_and_store.py to persist it)")
+            index = InvertedIndex.build(corpus)
+    _corpus, _index, _version, _options = corpus, index, version, (memory_budget, use_index)
+
+
+def load_worker_state(memory_budget: int = CORPUS_CACHE_BYTES, use_index: bool = True) -> None:
+    """
+    Memuat korpus dan index sekali per proses. Worker hasil fork mewarisi state
+    milik parent (sudah terisi, sehingga tidak dimuat ulang); pada start method
+    lain setiap worker memuatnya sendiri lewat init_worker.
+    """
+    if _corpus is None:
+        _load(memory_budget, use_index)
+
+
+def refresh_worker_state() -> bool:
+    """
+    Memuat ulang korpus dan index jika versi korpus berubah sejak dimuat
+    (misalnya setelah extract_and_store.py dijalankan ulang). Mengembalikan
+    True jika state dimuat ulang.
+    """
+    if _corpus is None or corpus_version() == _version:
+        return False
+    print("Corpus changed on disk, reloading corpus and index")
+    _load(*_options)
+    return True
+
+
+def init_worker(memory_budget: int = CORPUS_CACHE_BYTES, use_index: bool = True) -> None:
+    """Initializer ProcessPoolExecutor; print dari service dialihkan ke stderr supaya stdout tetap bersih."""
+    sys.stdout = sys.stderr
+    load_worker_state(memory_budget, use_index)
+
+
+def worker_info() -> Dict[str, Any]:
+    return {"cv_count": len(_corpus or []), "index": _index is not None, "corpus_version": _version}
+
+
+def run_query(query: Dict[str, Any], attach_names: bool = True, include_trace: bool = False) -> Dict[str, Any]:
+    """
+    Menjalankan satu query (keywords, algorithm, max_results, max_distance, id
+    opsional) pada korpus proses ini, yang dimuat ulang lebih dulu jika korpus
+    di disk sudah berubah. Hasilnya berisi field search_data ditambah
+    elapsed_ms (trace dan statistik cache korpus hanya jika include_trace);
+    exception dikembalikan sebagai field "error", bukan dilempar.
+    """
+    record = {key: query[key] for key in ("id", "keywords", "algorithm", "max_results") if key in query}
+    start = time.perf_counter()
+    try:
+        refresh_worker_state()
+        search_data = search_keywords(
+            query["keywords"], query["algorithm"], query["max_results"], _corpus, _index,
+            max_distance=query.get("max_distance", 1), attach_names=attach_names,
+        )
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    else:
+        if not include_trace:
+            search_data.pop("trace", None)
+            search_data.pop("corpus_cache", None)
+        record.update(search_data)
+    record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return record
@@ -0,0 +1,152 @@
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+STRUCTURED_DB_PATH = os.path.join("data", "structured_info.db")
+STRUCTURED_JSON_DIR = os.path.join("data", "structured_info")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS structured_info (
+    filename TEXT PRIMARY KEY,
+    role TEXT,
+    text_length INTEGER,
+    processed_at TEXT,
+    sections BLOB NOT NULL,
+    summary_sections BLOB
+)
+"""
+_COLUMNS = "filename, role, text_length, processed_at, sections, summary_sections"
+
+
+def _dumps(value) -> Optional[bytes]:
+    if value is None:
+        return None
+    return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def _loads(blob: bytes):
+    return json.loads(zlib.decompress(blob))
+
+
+def _to_record(row) -> Dict[str, Any]:
+    filename, role, text_length, processed_at, sections, summary_sections = row
+    record = {
+        "filename": filename, "role": role, "sections": _loads(sections),
+        "text_length": text_length, "processed_at": processed_at,
+    }
+    if summary_sections is not None:
+        record["summary_sections"] = _loads(summary_sections)
+    return record
+
+
+class StructuredStore:
+    """
+    Penyimpanan structured_info semua CV dalam satu file SQLite. Setiap CV
+    adalah satu baris dengan primary key nama file (tanpa ekstensi), sehingga
+    lookup per CV cukup satu pencarian index tanpa membuka file sendiri. Bagian
+    CV disimpan sebagai JSON ringkas yang dikompresi zlib. Database memakai
+    mode WAL supaya GUI tetap bisa membaca selama ingest menulis. Satu koneksi
+    dipakai bersama antar thread dan dilindungi lock.
+    """
+
+    def __init__(self, path: str = STRUCTURED_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM structured_info").fetchone()[0]
+
+    def __contains__(self, filename: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM structured_info WHERE filename = ?", (filename,)).fetchone() is not None
+
+    def data_version(self) -> int:
+        """Berubah setiap kali koneksi lain (misalnya proses ingest) meng-commit perubahan ke file ini."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def filenames(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT filename FROM structured_info ORDER BY filename")]
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM structured_info WHERE filename = ?", (filename,)).fetchone()
+        return _to_record(row) if row else None
+
+    def get_summary_sections(self, filename: str) -> Optional[dict]:
+        """Hanya kolom summary_sections, tanpa men-decode bagian CV lainnya."""
+        with self._lock:
+            row = self._conn.execute("SELECT summary_sections FROM structured_info WHERE filename = ?", (filename,)).fetchone()
+        return _loads(row[0]) if row and row[0] is not None else None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Semua record terurut nama file, diambil bertahap per batch."""
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT {_COLUMNS} FROM structured_info WHERE filename > ? ORDER BY filename LIMIT 256", (last,)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _to_record(row)
+            last = rows[-1][0]
+
+    def write(self, records: Iterable[Dict[str, Any]] = (), deleted: Iterable[str] = ()) -> int:
+        """
+        Menyimpan (insert atau replace) records dan menghapus nama file pada deleted
+        dalam satu transaksi: semua perubahan masuk atau tidak sama sekali.
+        Mengembalikan jumlah record yang ditulis.
+        """
+        rows = [
+            (r["filename"], r.get("role"), r.get("text_length"), r.get("processed_at"),
+             _dumps(r.get("sections", {})), _dumps(r.get("summary_sections")))
+            for r in records
+        ]
+        deleted = [(filename,) for filename in deleted]
+        with self._lock, self._conn:
+            self._conn.executemany(f"INSERT OR REPLACE INTO structured_info ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.executemany("DELETE FROM structured_info WHERE filename = ?", deleted)
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def import_json_files(store: StructuredStore, folder_path: str = STRUCTURED_JSON_DIR, summary_fn=None) -> int:
+    """
+    Memindahkan file structured_info/<cv>.json lama ke store dalam satu transaksi.
+    Record tanpa summary_sections dilengkapi dengan summary_fn(filename) jika diberikan.
+    """
+    if not os.path.isdir(folder_path):
+        return 0
+    records = []
+    for name in sorted(os.listdir(folder_path)):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(folder_path, name), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except Exception as e:
+            print(f"Error importing {name}: {e}")
+            continue
+        record["filename"] = record.get("filename") or os.path.splitext(name)[0]
+        if "summary_sections" not in record and summary_fn is not None:
+            record["summary_sections"] = summary_fn(record["filename"])
+        records.append(record)
+    count = store.write(records)
+    print(f"Imported {count} structured_info JSON files -> {store.path}")
+    return count